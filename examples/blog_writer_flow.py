@@ -3,89 +3,183 @@
 from hawkins_agent import AgentBuilder
 from hawkins_agent.tools import RAGTool, WebSearchTool, SummarizationTool
 from hawkins_rag import HawkinsRAG
+from hawkins_agent.runtime import run
+from dotenv import load_dotenv
 import logging
+import logging.handlers
+import queue
 import os
 import asyncio
 import tempfile
-import shutil
-
-# Setup logging with more detailed format
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import hashlib
+
+# Load API keys from .env
+load_dotenv()
+
+# Setup logging with more detailed format. Records are handed to a queue
+# and written by a background listener so steps never block on stderr.
+log_queue = queue.Queue(-1)
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+))
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+log_listener = logging.handlers.QueueListener(log_queue, console_handler)
 logger = logging.getLogger(__name__)
 
+class CachedRAG:
+    """HawkinsRAG wrapper that skips reloading identical documents and repeat queries"""
+
+    def __init__(self, rag):
+        self.rag = rag
+        self._loaded = set()
+        self._answers = {}
+
+    def _write_and_load(self, documents):
+        for path, content in documents:
+            with open(path, 'w') as f:
+                f.write(content)
+            self.rag.load_document(path, source_type="text")
+
+    async def load_texts(self, documents):
+        """Write and load several (path, content) pairs in one batch
+
+        Documents whose text is already indexed are skipped.
+        """
+        new_docs = {}
+        for path, content in documents:
+            digest = hashlib.blake2b(content.encode()).hexdigest()
+            if digest in self._loaded or digest in new_docs:
+                logger.info("Skipping already loaded document: %s", path)
+                continue
+            new_docs[digest] = (path, content)
+
+        if not new_docs:
+            return
+
+        # Disk writes and indexing are blocking, keep them off the event loop
+        await asyncio.to_thread(self._write_and_load, list(new_docs.values()))
+        self._loaded.update(new_docs)
+        # New content can change answers
+        self._answers.clear()
+
+    async def load_text(self, path, content):
+        """Write content to path and load it unless the same text is already indexed"""
+        await self.load_texts([(path, content)])
+
+    async def query(self, prompt):
+        """Query the RAG system, reusing the answer for a prompt seen before"""
+        key = hashlib.sha256(prompt.encode()).hexdigest()
+        if key not in self._answers:
+            response = await asyncio.to_thread(self.rag.query, prompt)
+            self._answers[key] = str(response)
+        return self._answers[key]
+
 class SimpleFlow:
     """A simplified flow manager for RAG operations"""
 
     def __init__(self):
         self.steps = []
+        self._steps_by_name = {}
+        self.graph = {}
+        self._dependents = {}
+        self._roots = []
 
     def add_step(self, name, func, requires=None):
-        self.steps.append({
+        step = {
             'name': name,
             'func': func,
             'requires': requires or []
-        })
+        }
+        self.steps.append(step)
+        self._steps_by_name[name] = step
+        self.graph[name] = list(requires or [])
+        self._build_schedule()
+
+    def _build_schedule(self):
+        """Precompute the dependency schedule so execute never rescans requires"""
+        self._dependents = {name: [] for name in self.graph}
+        for name, requires in self.graph.items():
+            for req in requires:
+                if req in self._dependents:
+                    self._dependents[req].append(name)
+        self._roots = [name for name, requires in self.graph.items() if not requires]
+
+    async def _run_step(self, step, input_data, results):
+        try:
+            logger.info("Executing step: %s", step['name'])
+            return await step['func'](input_data, results)
+        except Exception as e:
+            logger.error("Error in step %s: %s", step['name'], e)
+            return {'error': str(e)}
 
     async def execute(self, input_data):
         results = {}
-        for step in self.steps:
-            try:
-                # Wait for required steps
-                for req in step['requires']:
-                    if req not in results:
-                        raise Exception(f"Required step {req} not completed")
-
-                # Execute step
-                logger.info(f"Executing step: {step['name']}")
-                result = await step['func'](input_data, results)
-                results[step['name']] = result
-
-            except Exception as e:
-                logger.error(f"Error in step {step['name']}: {str(e)}")
-                results[step['name']] = {'error': str(e)}
+        remaining = {name: len(requires) for name, requires in self.graph.items()}
+        running = {}
+
+        def start(name):
+            task = asyncio.create_task(self._run_step(self._steps_by_name[name], input_data, results))
+            running[task] = name
+
+        for name in self._roots:
+            start(name)
+
+        # Launch each step the moment its last requirement finishes
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                results[name] = task.result()
+                for dependent in self._dependents[name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        start(dependent)
+
+        # Anything left never had all of its requirements satisfied
+        for name, requires in self.graph.items():
+            if name not in results:
+                missing = next(req for req in requires if req not in results)
+                logger.error("Error in step %s: Required step %s not completed", name, missing)
+                results[name] = {'error': f"Required step {missing} not completed"}
 
         return results
 
 async def main():
     """Demonstrate blog writing with RAG system"""
     try:
-        # Initialize knowledge bases
-        logger.info("Initializing RAG systems...")
-        research_rag = HawkinsRAG()
-        writer_rag = HawkinsRAG()
-        editor_rag = HawkinsRAG()
+        # One shared knowledge base: each stage indexes its output once and
+        # later stages retrieve from the same store
+        logger.info("Initializing RAG system...")
+        rag = CachedRAG(HawkinsRAG())
 
-        # Create temp directory for document storage
-        temp_dir = tempfile.mkdtemp()
-        logger.info(f"Created temporary directory: {temp_dir}")
+        # Create temp directory for document storage; it is removed when
+        # the block exits, including on errors
+        with tempfile.TemporaryDirectory() as temp_dir:
+            logger.info("Created temporary directory: %s", temp_dir)
 
-        try:
             async def research_step(input_data, previous_results):
                 """Execute research phase"""
                 topic = input_data.get("topic", "AI trends")
-                logger.info(f"Researching topic: {topic}")
+                logger.info("Researching topic: %s", topic)
 
                 try:
                     # Store topic
                     topic_file = os.path.join(temp_dir, "topic.txt")
-                    with open(topic_file, 'w') as f:
-                        f.write(f"Research topic: {topic}")
-                    research_rag.load_document(topic_file, source_type="text")
+                    await rag.load_text(topic_file, f"Research topic: {topic}")
 
                     # Query RAG
-                    response = research_rag.query(
+                    research_text = await rag.query(
                         f"Research this topic thoroughly and gather key information: {topic}"
                     )
-                    research_text = str(response)
 
                     logger.info("Research completed successfully")
                     return {'content': research_text}
 
                 except Exception as e:
-                    logger.error(f"Research error: {str(e)}")
+                    logger.error("Research error: %s", e)
                     return {'error': str(e)}
 
             async def writing_step(input_data, previous_results):
@@ -96,23 +190,20 @@ async def main():
 
                     logger.info("Writing draft based on research...")
 
-                    # Store research for writer
+                    # Index research in the shared store
                     research_file = os.path.join(temp_dir, "research.txt")
-                    with open(research_file, 'w') as f:
-                        f.write(research)
-                    writer_rag.load_document(research_file, source_type="text")
+                    await rag.load_text(research_file, research)
 
                     # Generate draft
-                    response = writer_rag.query(
+                    draft_text = await rag.query(
                         f"Write a {style} blog post based on this research: {research}"
                     )
-                    draft_text = str(response)
 
                     logger.info("Draft completed successfully")
                     return {'content': draft_text}
 
                 except Exception as e:
-                    logger.error(f"Writing error: {str(e)}")
+                    logger.error("Writing error: %s", e)
                     return {'error': str(e)}
 
             async def editing_step(input_data, previous_results):
@@ -121,23 +212,20 @@ async def main():
                     draft = previous_results['writing']['content']
                     logger.info("Editing draft...")
 
-                    # Store draft for editor
+                    # Index draft in the shared store
                     draft_file = os.path.join(temp_dir, "draft.txt")
-                    with open(draft_file, 'w') as f:
-                        f.write(draft)
-                    editor_rag.load_document(draft_file, source_type="text")
+                    await rag.load_text(draft_file, draft)
 
                     # Edit draft
-                    response = editor_rag.query(
+                    final_text = await rag.query(
                         "Edit and improve this blog post draft for clarity, engagement and professionalism: " + draft
                     )
-                    final_text = str(response)
 
                     logger.info("Editing completed successfully")
                     return {'content': final_text}
 
                 except Exception as e:
-                    logger.error(f"Editing error: {str(e)}")
+                    logger.error("Editing error: %s", e)
                     return {'error': str(e)}
 
             # Configure flow
@@ -155,7 +243,7 @@ async def main():
                 "style": "informative and engaging"
             }
 
-            logger.info(f"Input: {input_data}")
+            logger.info("Input: %s", input_data)
             results = await flow.execute(input_data)
 
             # Display results
@@ -163,21 +251,22 @@ async def main():
             logger.info("=" * 50)
 
             for step_name, result in results.items():
-                logger.info(f"\n{step_name.upper()} OUTPUT:")
+                logger.info("\n%s OUTPUT:", step_name.upper())
                 logger.info("-" * 40)
                 if 'error' in result:
-                    logger.error(f"Error in {step_name}: {result['error']}")
+                    logger.error("Error in %s: %s", step_name, result['error'])
                 else:
                     logger.info(result['content'])
 
-        finally:
-            # Clean up temp directory
-            shutil.rmtree(temp_dir)
-            logger.info("Cleaned up temporary directory")
+        logger.info("Cleaned up temporary directory")
 
     except Exception as e:
-        logger.error(f"Error in blog writing workflow: {str(e)}", exc_info=True)
+        logger.error("Error in blog writing workflow: %s", e, exc_info=True)
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    log_listener.start()
+    try:
+        run(main())
+    finally:
+        log_listener.stop()
\ No newline at end of file
@@ -4,13 +4,21 @@ Shows how to load documents and query them using RAG capabilities.
 """
 from hawkins_agent import Agent, AgentConfig
 from hawkins_agent.tools import RAGTool
+from hawkins_agent.runtime import run
+from dotenv import load_dotenv
 import asyncio
 import logging
 
+# Load API keys from .env
+load_dotenv()
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of agent requests in flight at once
+MAX_CONCURRENT_REQUESTS = 4
+
 async def main():
     # Configure the agent
     config = AgentConfig(
@@ -49,20 +57,28 @@ async def main():
 
     print("\nTesting AI agent with knowledge base capabilities...")
 
-    # Load documents
-    for doc in documents:
-        print(f"\nLoading document about {doc['metadata']['topic']}...")
-        result = await agent.execute(
-            task=f"Load document about {doc['metadata']['topic']}",
-            context={
-                "knowledge_action": {
-                    "operation": "load",
-                    "content": doc["content"],
-                    "source_type": "text",
-                    "metadata": doc["metadata"]
+    # Limit how many requests hit the backend at once
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def load_document(doc):
+        async with semaphore:
+            return await agent.execute(
+                task=f"Load document about {doc['metadata']['topic']}",
+                context={
+                    "knowledge_action": {
+                        "operation": "load",
+                        "content": doc["content"],
+                        "source_type": "text",
+                        "metadata": doc["metadata"]
+                    }
                 }
-            }
-        )
+            )
+
+    # Load documents
+    print(f"\nLoading {len(documents)} documents...")
+    load_results = await asyncio.gather(*(load_document(doc) for doc in documents))
+
+    for doc, result in zip(documents, load_results):
         if result.get("success"):
             print(f"✓ Successfully loaded document about {doc['metadata']['topic']}")
         else:
@@ -78,18 +94,22 @@ async def main():
 
     print("\nTesting knowledge base queries...")
 
-    for query in test_queries:
-        print(f"\nQuery: {query}")
-        result = await agent.execute(
-            task=query,
-            context={
-                "knowledge_action": {
-                    "operation": "query",
-                    "query": query
+    async def run_query(query):
+        async with semaphore:
+            return await agent.execute(
+                task=query,
+                context={
+                    "knowledge_action": {
+                        "operation": "query",
+                        "query": query
+                    }
                 }
-            }
-        )
+            )
 
+    query_results = await asyncio.gather(*(run_query(query) for query in test_queries))
+
+    for query, result in zip(test_queries, query_results):
+        print(f"\nQuery: {query}")
         if result.get("success"):
             print("Answer:", result.get("answer"))
         else:
@@ -104,4 +124,4 @@ async def main():
                 print(f"  Answer: {memory['properties'].get('final_answer')}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -2,12 +2,21 @@
 
 from hawkins_agent import AgentBuilder
 from hawkins_agent.tools import WebSearchTool, WeatherTool
-from hawkins_agent.llm import LiteLLMProvider
+from hawkins_agent.llm import LiteLLMProvider, create_http_client
+from hawkins_agent.runtime import run
+from dotenv import load_dotenv
 import logging
 import os
+import argparse
 import asyncio
-import json
-from datetime import datetime, timedelta
+import orjson
+import hashlib
+import time
+from array import array
+from collections import OrderedDict
+
+# Load API keys from .env
+load_dotenv()
 
 # Setup logging
 logging.basicConfig(
@@ -16,65 +25,205 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Cap concurrent LLM/API calls to stay within provider rate limits
+MAX_CONCURRENT_CALLS = 3
+call_semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+
+# Responses for identical (model, agent, prompt, context) requests are reused
+RESPONSE_CACHE_SIZE = 128
+response_cache = OrderedDict()
+
+async def cached_process(agent, prompt, context=None):
+    """Run agent.process, reusing the response to an identical earlier request
+
+    Upstream step output is part of each downstream prompt, so a downstream
+    step only hits the LLM again when its inputs actually changed. Concurrent
+    identical requests (e.g. several flows planning the same trip) already
+    share one call in LiteLLMProvider.
+    """
+    key = hashlib.sha256(orjson.dumps(
+        [agent.llm.model, agent.name, prompt, context],
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )).hexdigest()
+
+    if key in response_cache:
+        response_cache.move_to_end(key)
+        logger.info("Using cached response for %s", agent.name)
+        return response_cache[key]
+
+    async with call_semaphore:
+        response = await agent.process(prompt, context=context)
+
+    # Only keep successful responses
+    if "error" not in response.metadata:
+        response_cache[key] = response
+        if len(response_cache) > RESPONSE_CACHE_SIZE:
+            response_cache.popitem(last=False)
+    return response
+
 class TripFlow:
-    """Simple flow manager for trip planning"""
+    """Simple flow manager for trip planning
+
+    The dependency graph is compiled as steps are added: each step gets an
+    integer id, and requirements are stored as id lists so execute only
+    walks integer arrays.
+
+    With a checkpoint_dir, each successful step result is saved as JSON
+    together with a hash of its inputs (the flow input and its required steps'
+    results). A retry after a failed run reuses those results instead of
+    calling the agents again. Checkpoints are removed once a run completes
+    without errors, and ignored once they are older than max_age seconds.
+    """
     
-    def __init__(self):
-        self.steps = []
+    def __init__(self, checkpoint_dir=None, flow_id="trip", max_age=6 * 60 * 60):
+        self._names = []
+        self._funcs = []
+        self._deps = []
+        self._dependents = []
+        self._name_to_id = {}
+        self.checkpoint_dir = checkpoint_dir
+        self.flow_id = flow_id
+        self.max_age = max_age
+        if checkpoint_dir:
+            os.makedirs(checkpoint_dir, mode=0o700, exist_ok=True)
         
     def add_step(self, name, func, requires=None):
-        self.steps.append({
-            'name': name,
-            'func': func,
-            'requires': requires or []
-        })
+        if name in self._name_to_id:
+            raise ValueError(f"Step {name} already added")
+
+        deps = []
+        for req in requires or []:
+            if req not in self._name_to_id:
+                raise ValueError(f"Step {name} requires unknown step {req}")
+            deps.append(self._name_to_id[req])
+
+        step_id = len(self._names)
+        self._names.append(name)
+        self._funcs.append(func)
+        self._deps.append(deps)
+        self._dependents.append([])
+        self._name_to_id[name] = step_id
+        for dep in deps:
+            self._dependents[dep].append(step_id)
         
-    async def execute(self, input_data):
-        results = {}
-        for step in self.steps:
+    def _checkpoint_path(self, name):
+        return os.path.join(self.checkpoint_dir, f"{self.flow_id}_{name}.json")
+
+    def _input_hash(self, step_id, input_data, results):
+        upstream = {self._names[dep]: results[self._names[dep]] for dep in self._deps[step_id]}
+        return hashlib.sha256(orjson.dumps(
+            [input_data, upstream],
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )).hexdigest()
+
+    def _load_checkpoint(self, name, input_hash):
+        try:
+            with open(self._checkpoint_path(name), 'rb') as f:
+                checkpoint = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        if checkpoint.get('input_hash') != input_hash:
+            return None
+        if time.time() - checkpoint.get('saved_at', 0) > self.max_age:
+            return None
+        return checkpoint['result']
+
+    def _save_checkpoint(self, name, input_hash, result):
+        try:
+            with open(self._checkpoint_path(name), 'wb') as f:
+                f.write(orjson.dumps(
+                    {'input_hash': input_hash, 'saved_at': time.time(), 'result': result},
+                    default=str
+                ))
+        except (OSError, orjson.JSONEncodeError) as e:
+            logger.warning("Could not checkpoint step %s: %s", name, e)
+
+    def clear_checkpoints(self):
+        """Remove this flow's checkpoints so the next run starts from scratch"""
+        for name in self._names:
+            try:
+                os.remove(self._checkpoint_path(name))
+            except FileNotFoundError:
+                pass
+
+    async def _run_step(self, tg, step_id, input_data, results, remaining):
+        name = self._names[step_id]
+        input_hash = None
+        result = None
+        if self.checkpoint_dir:
+            input_hash = self._input_hash(step_id, input_data, results)
+            result = self._load_checkpoint(name, input_hash)
+            if result is not None:
+                logger.info("Reusing checkpoint for step: %s", name)
+
+        if result is None:
             try:
-                # Check requirements
-                for req in step['requires']:
-                    if req not in results:
-                        raise Exception(f"Required step {req} not completed")
-                
-                # Execute step
-                logger.info(f"Executing step: {step['name']}")
-                result = await step['func'](input_data, results)
-                results[step['name']] = result
-                
+                logger.info("Executing step: %s", name)
+                result = await self._funcs[step_id](input_data, results)
             except Exception as e:
-                logger.error(f"Error in step {step['name']}: {str(e)}")
-                results[step['name']] = {'error': str(e)}
-                
+                logger.error("Error in step %s: %s", name, e)
+                result = {'error': str(e)}
+            if input_hash and 'error' not in result:
+                self._save_checkpoint(name, input_hash, result)
+
+        results[name] = result
+
+        # Start dependents from inside the task so the group is still open
+        for dependent in self._dependents[step_id]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                tg.create_task(self._run_step(tg, dependent, input_data, results, remaining))
+
+    async def execute(self, input_data):
+        results = {}
+        remaining = array('i', (len(deps) for deps in self._deps))
+
+        # The task group owns every step: cancelling execute cancels them all
+        async with asyncio.TaskGroup() as tg:
+            for step_id, count in enumerate(remaining):
+                if count == 0:
+                    tg.create_task(self._run_step(tg, step_id, input_data, results, remaining))
+
+        # A clean run leaves nothing to resume from
+        if self.checkpoint_dir and not any('error' in result for result in results.values()):
+            self.clear_checkpoints()
+
         return results
 
-async def main():
-    """Plan a 5-day Maldives trip using multiple specialized agents"""
+async def main(fresh=False):
+    """Plan a 5-day Maldives trip using multiple specialized agents
+
+    Args:
+        fresh: Ignore checkpoints left by an earlier failed run
+    """
+    # One keep-alive HTTP client shared by all agents
+    http_client = create_http_client()
     try:
         # Initialize tools
         logger.info("Initializing tools...")
-        weather_tool = WeatherTool()
+        weather_tool = WeatherTool(client=http_client)
         search_tool = WebSearchTool(api_key=os.environ.get("TAVILY_API_KEY"))
 
         # Create research agent for destination info
         logger.info("Creating agents...")
         researcher = (AgentBuilder("destination_researcher")
                     .with_model("gpt-4o")
-                    .with_provider(LiteLLMProvider, temperature=0.7)
+                    .with_provider(LiteLLMProvider, temperature=0.7, http_client=http_client)
                     .with_tool(search_tool)
                     .build())
 
         # Create activity planner agent
         activity_planner = (AgentBuilder("activity_planner")
                          .with_model("gpt-4o")
-                         .with_provider(LiteLLMProvider, temperature=0.8)
+                         .with_provider(LiteLLMProvider, temperature=0.8, http_client=http_client)
                          .build())
 
         # Create logistics agent
         logistics_agent = (AgentBuilder("logistics_planner")
                         .with_model("gpt-4o")
-                        .with_provider(LiteLLMProvider, temperature=0.6)
+                        .with_provider(LiteLLMProvider, temperature=0.6, http_client=http_client)
                         .with_tool(weather_tool)
                         .build())
 
@@ -82,11 +231,15 @@ async def main():
             """Research Maldives destinations and key information"""
             logger.info("Researching Maldives destinations...")
             
-            response = await researcher.process(
+            response = await cached_process(
+                researcher,
                 "Research the best areas to stay in Maldives for a 5-day trip, "
                 "including popular resorts, must-visit locations, and travel tips. "
                 "Focus on practical information for trip planning."
             )
+
+            if "error" in response.metadata:
+                return {'error': response.metadata['error']}
             
             return {
                 'content': response.message,
@@ -98,38 +251,61 @@ async def main():
             logger.info("Planning daily activities...")
             
             research = previous_results['research']['content']
-            response = await activity_planner.process(
+            response = await cached_process(
+                activity_planner,
                 f"Based on this research: {research}\n"
                 "Create a detailed 5-day itinerary for the Maldives with specific "
                 "activities for each day. Include water sports, relaxation time, "
                 "and cultural experiences. Format as a day-by-day schedule."
             )
+
+            if "error" in response.metadata:
+                return {'error': response.metadata['error']}
             
             return {
                 'content': response.message,
                 'itinerary': response.metadata.get('itinerary', {})
             }
 
+        async def check_weather(input_data, previous_results):
+            """Fetch current weather for the capital as a reference"""
+            logger.info("Checking weather in Male...")
+
+            async with call_semaphore:
+                response = await weather_tool.execute(query="Male,MV")
+
+            if not response.success:
+                return {'error': response.error}
+            return {
+                'content': (
+                    f"{response.result['description']}, "
+                    f"{response.result['temperature']}°C"
+                ),
+                'weather': response.result
+            }
+
         async def plan_logistics(input_data, previous_results):
             """Plan accommodation and transportation"""
             logger.info("Planning logistics...")
             
             research = previous_results['research']['content']
             activities = previous_results['activities']['content']
+            weather = previous_results['weather'].get('content', 'unavailable')
             
-            # Check weather for trip dates
-            start_date = datetime.now() + timedelta(days=30)  # Plan for next month
-            weather_query = f"Male,MV"  # Capital city as reference
-            
-            response = await logistics_agent.process(
+            response = await cached_process(
+                logistics_agent,
                 f"Based on the research: {research}\n"
                 f"And planned activities: {activities}\n"
+                f"Current weather in Male: {weather}\n"
                 "Provide detailed logistics planning including:\n"
                 "1. Recommended resorts/hotels\n"
                 "2. Transportation between islands\n"
                 "3. Estimated costs\n"
                 "4. Booking tips"
             )
+
+            if "error" in response.metadata:
+                return {'error': response.metadata['error']}
             
             return {
                 'content': response.message,
@@ -137,10 +313,18 @@ async def main():
             }
 
         # Configure flow
-        flow = TripFlow()
+        # Checkpoints live in the user's own cache directory, not the shared /tmp
+        flow = TripFlow(
+            checkpoint_dir=os.path.join(
+                os.path.expanduser("~"), ".cache", "hawkins_agent", "maldives_trip_planner"
+            )
+        )
         flow.add_step('research', research_step)
+        flow.add_step('weather', check_weather)
         flow.add_step('activities', plan_activities, ['research'])
-        flow.add_step('logistics', plan_logistics, ['research', 'activities'])
+        flow.add_step('logistics', plan_logistics, ['research', 'activities', 'weather'])
+        if fresh:
+            flow.clear_checkpoints()
 
         # Execute flow
         logger.info("\nStarting Maldives trip planning...")
@@ -153,16 +337,25 @@ async def main():
         logger.info("=" * 50)
 
         for step_name, result in results.items():
-            logger.info(f"\n{step_name.upper()}:")
-            logger.info("-" * 40)
             if 'error' in result:
-                logger.error(f"Error in {step_name}: {result['error']}")
-            else:
+                logger.error("Error in %s: %s", step_name, result['error'])
+            elif logger.isEnabledFor(logging.INFO):
+                logger.info("\n%s:", step_name.upper())
+                logger.info("-" * 40)
                 logger.info(result['content'])
 
     except Exception as e:
-        logger.error(f"Error in trip planning: {str(e)}", exc_info=True)
+        logger.error("Error in trip planning: %s", e, exc_info=True)
         raise
+    finally:
+        await http_client.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore checkpoints from an earlier failed run and plan from scratch"
+    )
+    args = parser.parse_args()
+    run(main(fresh=args.fresh))
@@ -1,45 +1,61 @@
 """Test different LLM models using LiteLLM integration"""
 
 from hawkins_agent import AgentBuilder
-from hawkins_agent.llm import LiteLLMProvider
+from hawkins_agent.llm import LiteLLMProvider, create_http_client
+from hawkins_agent.runtime import run
+from dotenv import load_dotenv
 import asyncio
 import logging
 
+# Load API keys from .env
+load_dotenv()
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 async def main():
     """Test different LLM models"""
+    # One keep-alive HTTP client shared by both agents
+    http_client = create_http_client()
     try:
         # Create an OpenAI agent
         logger.info("Creating agent with GPT-4o...")
         openai_agent = (AgentBuilder("openai_assistant")
                      .with_model("openai/gpt-4o")  # Latest OpenAI model
-                     .with_provider(LiteLLMProvider, temperature=0.7)
+                     .with_provider(LiteLLMProvider, temperature=0.7, http_client=http_client)
                      .build())
 
         # Create an Anthropic agent
         logger.info("Creating agent with Claude 3...")
         anthropic_agent = (AgentBuilder("anthropic_assistant")
                         .with_model("anthropic/claude-3-sonnet-20240229")  # Claude model
-                        .with_provider(LiteLLMProvider, temperature=0.5)
+                        .with_provider(LiteLLMProvider, temperature=0.5, http_client=http_client)
                         .build())
 
         # Test both agents
         test_message = "What is the capital of France?"
 
-        logger.info("\nTesting OpenAI agent...")
-        openai_response = await openai_agent.process(test_message)
-        logger.info(f"OpenAI Response: {openai_response.message}")
-
-        logger.info("\nTesting Anthropic agent...")
-        anthropic_response = await anthropic_agent.process(test_message)
-        logger.info(f"Anthropic Response: {anthropic_response.message}")
+        # The providers are independent, so query both at once; a failure
+        # in one does not cancel the other
+        logger.info("\nTesting OpenAI and Anthropic agents...")
+        openai_response, anthropic_response = await asyncio.gather(
+            openai_agent.process(test_message),
+            anthropic_agent.process(test_message),
+            return_exceptions=True
+        )
+
+        for provider, response in (("OpenAI", openai_response), ("Anthropic", anthropic_response)):
+            if isinstance(response, Exception):
+                logger.error("%s agent failed: %s", provider, response)
+            else:
+                logger.info("%s Response: %s", provider, response.message)
 
     except Exception as e:
-        logger.error(f"Error testing models: {str(e)}", exc_info=True)
+        logger.error("Error testing models: %s", e, exc_info=True)
         raise
+    finally:
+        await http_client.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -4,17 +4,24 @@ from hawkins_agent import AgentBuilder
 from hawkins_agent.tools import RAGTool, WebSearchTool
 from hawkins_agent.mock import KnowledgeBase, Document
 from hawkins_agent.flow import FlowManager, FlowStep
-from hawkins_agent.llm import LiteLLMProvider
+from hawkins_agent.llm import LiteLLMProvider, create_http_client
+from hawkins_agent.runtime import run
+from dotenv import load_dotenv
 import logging
 import os
 import asyncio
 
+# Load API keys from .env
+load_dotenv()
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 async def main():
     """Demonstrate multi-agent workflow with flow control"""
+    # One keep-alive HTTP client shared by both agents
+    http_client = create_http_client()
     try:
         # Set up logging
         logging.basicConfig(
@@ -42,11 +49,11 @@ async def main():
             Document("Provide comprehensive support for AI integration")
         ]
 
-        # Add documents to knowledge bases
-        for doc in research_docs:
-            await research_kb.add_document(doc)
-        for doc in support_docs:
-            await support_kb.add_document(doc)
+        # Add documents to both knowledge bases at once, one bulk call each
+        await asyncio.gather(
+            research_kb.add_documents(research_docs),
+            support_kb.add_documents(support_docs)
+        )
 
         # Get Tavily API key for web search
         tavily_api_key = os.getenv("TAVILY_API_KEY")
@@ -58,7 +65,7 @@ async def main():
         logger.info("Creating research agent...")
         researcher = (AgentBuilder("researcher")
                      .with_model("openai/gpt-4o")  # Latest OpenAI model
-                     .with_provider(LiteLLMProvider, temperature=0.7)
+                     .with_provider(LiteLLMProvider, temperature=0.7, http_client=http_client)
                      .with_knowledge_base(research_kb)
                      .with_tool(WebSearchTool(api_key=tavily_api_key))
                      .with_memory({"retention_days": 7})
@@ -68,7 +75,7 @@ async def main():
         logger.info("Creating support agent...")
         support = (AgentBuilder("support")
                    .with_model("anthropic/claude-3-sonnet-20240229")  # Claude 3 for summaries
-                   .with_provider(LiteLLMProvider, temperature=0.5)
+                   .with_provider(LiteLLMProvider, temperature=0.5, http_client=http_client)
                    .with_knowledge_base(support_kb)
                    .with_tool(RAGTool(support_kb))
                    .with_memory({"retention_days": 30})
@@ -119,26 +126,29 @@ async def main():
         })
 
         # Display results
-        logger.info("\n" + "="*50)
+        logger.info("\n%s", "=" * 50)
         logger.info("Research Findings:")
         logger.info("="*50)
         logger.info(results["research"]["research_findings"])
 
-        logger.info("\n" + "="*50)
+        logger.info("\n%s", "=" * 50)
         logger.info("Summarized Insights:")
         logger.info("="*50)
         logger.info(results["summarize"]["summary"])
 
         # Log tool usage
-        for step, data in results.items():
-            if data.get("tool_calls"):
-                logger.info(f"\nTools used in {step} phase:")
-                for call in data["tool_calls"]:
-                    logger.info(f"- {call['name']}: {call['parameters']}")
+        if logger.isEnabledFor(logging.INFO):
+            for step, data in results.items():
+                if data.get("tool_calls"):
+                    logger.info("\nTools used in %s phase:", step)
+                    for call in data["tool_calls"]:
+                        logger.info("- %s: %s", call['name'], call['parameters'])
 
     except Exception as e:
-        logger.error(f"Error in multi-agent workflow: {str(e)}", exc_info=True)
+        logger.error("Error in multi-agent workflow: %s", e, exc_info=True)
         raise
+    finally:
+        await http_client.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -1,17 +1,22 @@
 """Multi-agent system for planning a 4-day Chennai-Golden Triangle-Chennai trip"""
 
 from hawkins_agent import AgentBuilder
-from hawkins_agent.tools import WebSearchTool, WeatherTool
-from hawkins_agent.llm import LiteLLMProvider
+from hawkins_agent.tools import WebSearchTool, WebSearchBatchTool, WeatherTool
+from hawkins_agent.llm import LiteLLMProvider, create_http_client
+from hawkins_agent.runtime import RateLimiter, bounded_process, bounded_stream, run
+from dotenv import load_dotenv
+import io
 import logging
 import os
+import sys
+import argparse
 import asyncio
+import hashlib
 import json
 from datetime import datetime, timedelta
 
 # API keys setup
-os.environ["OPENAI_API_KEY"]=""
-os.environ["TAVILY_API_KEY"]=""
+load_dotenv()
 
 # Setup logging
 logging.basicConfig(
@@ -20,79 +25,287 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Upper bound on the upstream summaries added to a step's prompt
+MAX_CTX_TOKENS = 1500
+
+def upstream_context(previous_results, sections):
+    """Build the prompt preamble from earlier steps' summaries
+
+    Args:
+        previous_results: Results of the steps run so far
+        sections: (step name, label) pairs, oldest step first
+
+    Returns:
+        One "label: summary" line per step; the oldest lines are dropped
+        first if the estimated size exceeds MAX_CTX_TOKENS
+    """
+    lines = []
+    for name, label in sections:
+        result = previous_results[name]
+        lines.append(f"{label}: {result.get('summary', result['content'])}")
+
+    # Roughly four characters per token
+    while len(lines) > 1 and sum(len(line) for line in lines) // 4 > MAX_CTX_TOKENS:
+        lines.pop(0)
+    return "".join(f"{line}\n" for line in lines)
+
+# Bump to ignore step results cached by earlier versions, which could hold
+# LLM failures saved as ordinary content
+CACHE_VERSION = 2
+
+# Step statuses reported by TripFlow.execute
+COMPLETED = "completed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
 class TripFlow:
-    """Flow manager for 4-day Chennai-Golden Triangle trip planning"""
+    """Flow manager for 4-day Chennai-Golden Triangle trip planning
+
+    Steps start as soon as all of their required steps have finished, so
+    independent branches of the plan run concurrently. A failed step only
+    stops the steps that depend on it; the rest of the plan still runs. A
+    step fails if it raises or returns a result with an 'error' key.
+
+    With a cache_dir, successful step results are saved as JSON keyed by the
+    step's name and code, the flow input and its required steps' results.
+    A rerun loads unchanged steps from disk, so editing one prompt only
+    re-runs that step and the steps after it. Steps in force_steps, and
+    everything downstream of them, always run.
+    """
     
-    def __init__(self):
-        self.steps = []
+    def __init__(self, cache_dir=None, force_steps=()):
+        self.steps = {}
+        self.dependents = {}
+        self.cache_dir = cache_dir
+        self.force_steps = set(force_steps)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
         
     def add_step(self, name, func, requires=None):
-        self.steps.append({
+        requires = requires or []
+        if name in self.steps:
+            raise ValueError(f"Step {name} already added")
+        if self._would_create_cycle(name, requires):
+            raise ValueError(f"Step {name} would create a dependency cycle")
+
+        self.steps[name] = {
             'name': name,
             'func': func,
-            'requires': requires or []
-        })
+            'requires': requires
+        }
+        for req in requires:
+            self.dependents.setdefault(req, []).append(name)
+
+    def _would_create_cycle(self, name, requires):
+        """Check whether any requirement already depends on this step"""
+        stack = list(requires)
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current == name:
+                return True
+            if current in seen or current not in self.steps:
+                continue
+            seen.add(current)
+            stack.extend(self.steps[current]['requires'])
+        return False
+        
+    def _downstream(self, names):
+        """Return the given steps plus every step that transitively requires them"""
+        found = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in found:
+                found.add(name)
+                stack.extend(self.dependents.get(name, []))
+        return found
+
+    def _cache_path(self, name, input_data, results):
+        step = self.steps[name]
+        code = step['func'].__code__
+        # Prompt text lives in the function's constants, so editing it changes the key
+        key = json.dumps([
+            CACHE_VERSION,
+            name,
+            code.co_code.hex(),
+            [const for const in code.co_consts if isinstance(const, (str, int, float))],
+            input_data,
+            {req: results[req] for req in step['requires']}
+        ], sort_keys=True, default=str)
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}-{digest}.json")
+
+    async def _run_step(self, name, input_data, results, forced):
+        cache_path = None
+        if self.cache_dir and name not in forced:
+            cache_path = self._cache_path(name, input_data, results)
+            try:
+                with open(cache_path, encoding='utf-8') as f:
+                    logger.info("Loading cached result for step: %s", name)
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+
+        logger.info("Executing step: %s", name)
+        result = await self.steps[name]['func'](input_data, results)
+
+        if self.cache_dir and 'error' not in result:
+            cache_path = cache_path or self._cache_path(name, input_data, results)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, default=str)
+        return result
+
+    def _skip_dependents(self, name, outcomes):
+        """Mark every step that transitively requires name as skipped"""
+        stack = list(self.dependents.get(name, []))
+        while stack:
+            dependent = stack.pop()
+            if dependent in outcomes:
+                continue
+            logger.warning("Skipping step %s: required step %s failed", dependent, name)
+            outcomes[dependent] = {'status': SKIPPED, 'error': f"upstream {name} failed"}
+            stack.extend(self.dependents.get(dependent, []))
         
     async def execute(self, input_data):
+        """Run every step, as concurrently as the dependencies allow
+
+        Returns:
+            {name: {'status': ..., 'result' or 'error': ...}} for every step,
+            where status is COMPLETED, FAILED or SKIPPED
+        """
         results = {}
-        for step in self.steps:
-            try:
-                # Check requirements
-                for req in step['requires']:
-                    if req not in results:
-                        raise Exception(f"Required step {req} not completed")
-                
-                # Execute step
-                logger.info(f"Executing step: {step['name']}")
-                result = await step['func'](input_data, results)
-                results[step['name']] = result
-                
-            except Exception as e:
-                logger.error(f"Error in step {step['name']}: {str(e)}")
-                results[step['name']] = {'error': str(e)}
+        outcomes = {}
+        remaining = {name: len(step['requires']) for name, step in self.steps.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        inflight = {}
+        forced = self._downstream(self.force_steps)
+
+        while ready or inflight:
+            # Launch every step whose requirements are complete
+            for name in ready:
+                task = asyncio.create_task(self._run_step(name, input_data, results, forced))
+                inflight[task] = name
+            ready = []
+
+            done, _ = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = inflight.pop(task)
+                error = task.exception()
+                if error is None and 'error' in task.result():
+                    # Steps report a failed agent call as {'error': ...}
+                    error = task.result()['error']
+                if error is not None:
+                    # Don't spend calls on steps that need this one
+                    logger.error("Error in step %s: %s", name, error)
+                    outcomes[name] = {'status': FAILED, 'error': str(error)}
+                    self._skip_dependents(name, outcomes)
+                    continue
+
+                results[name] = task.result()
+                outcomes[name] = {'status': COMPLETED, 'result': results[name]}
+                for dependent in self.dependents.get(name, []):
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0 and dependent not in outcomes:
+                        ready.append(dependent)
+
+        # Steps whose requirements were never added cannot run
+        for name, step in self.steps.items():
+            if name not in outcomes:
+                missing = [req for req in step['requires'] if req not in outcomes]
+                logger.error("Error in step %s: required steps not completed: %s", name, missing)
+                outcomes[name] = {
+                    'status': SKIPPED,
+                    'error': f"required steps never ran: {', '.join(missing)}"
+                }
                 
-        return results
+        return {name: outcomes[name] for name in self.steps}
+
+async def main(force_steps=()):
+    """Plan a 4-day trip (3 nights) from Chennai covering Golden Triangle within ₹50,000 for 4 people
 
-async def main():
-    """Plan a 4-day trip (3 nights) from Chennai covering Golden Triangle within ₹50,000 for 4 people"""
+    Args:
+        force_steps: Steps to re-run (with everything after them) even if
+            cached results exist
+    """
+    # One keep-alive HTTP client shared by the weather tool and every agent
+    http_client = create_http_client()
     try:
         # Initialize tools
         logger.info("Initializing tools...")
-        weather_tool = WeatherTool()
+        weather_tool = WeatherTool(client=http_client)
         search_tool = WebSearchTool(api_key=os.environ.get("TAVILY_API_KEY"))
+        # Lets an agent ask for all of its searches in one tool call
+        batch_search_tool = WebSearchBatchTool(search_tool)
+
+        # All four agents share one OpenAI key, so they share one rate budget
+        rate_limiter = RateLimiter(rpm=500, tpm=30000)
 
+        # Bound output size, request time and retries for every agent
+        provider_limits = {
+            "max_tokens": 1024,
+            "timeout": 30,
+            "max_retries": 3,
+            "rate_limiter": rate_limiter,
+            "http_client": http_client
+        }
+
+        # The search and drafting steps run on the faster, cheaper model
         # Create travel agent for flight bookings
         travel_agent = (AgentBuilder("travel_agent")
-                     .with_model("gpt-4o")
-                     .with_provider(LiteLLMProvider, temperature=0.6)
+                     .with_model("gpt-4o-mini")
+                     .with_provider(LiteLLMProvider, temperature=0.6, **provider_limits)
                      .with_tool(search_tool)
+                     .with_tool(batch_search_tool)
                      .build())
 
         # Create research agent for destination info
         researcher = (AgentBuilder("destination_researcher")
-                    .with_model("gpt-4o")
-                    .with_provider(LiteLLMProvider, temperature=0.7)
+                    .with_model("gpt-4o-mini")
+                    .with_provider(LiteLLMProvider, temperature=0.7, **provider_limits)
                     .with_tool(search_tool)
+                    .with_tool(batch_search_tool)
                     .build())
 
         # Create activity planner agent with budget constraints
         activity_planner = (AgentBuilder("activity_planner")
-                         .with_model("gpt-4o")
-                         .with_provider(LiteLLMProvider, temperature=0.8)
+                         .with_model("gpt-4o-mini")
+                         .with_provider(LiteLLMProvider, temperature=0.8, **provider_limits)
                          .build())
 
-        # Create logistics agent with focus on budget management
+        # Create logistics agent with focus on budget management; it combines
+        # every earlier step into the final plan, so it keeps the stronger model
         logistics_agent = (AgentBuilder("logistics_planner")
                         .with_model("gpt-4o")
-                        .with_provider(LiteLLMProvider, temperature=0.6)
+                        .with_provider(LiteLLMProvider, temperature=0.6, **provider_limits)
                         .with_tool(weather_tool)
                         .build())
 
+        # Cheap model that condenses each step's output for later prompts
+        summarizer = (AgentBuilder("summarizer")
+                    .with_model("gpt-4o-mini")
+                    .with_provider(LiteLLMProvider, temperature=0.3, **{**provider_limits, "max_tokens": 300})
+                    .build())
+
+        async def summarize(content):
+            """Condense a step's output, falling back to the full text on error"""
+            response = await bounded_process(
+                summarizer,
+                "Summarize the key facts, choices and costs below in under 200 words:\n"
+                f"{content}",
+                # Each summary stands alone; earlier ones shouldn't leak into the prompt
+                stateless=True
+            )
+            if "error" in response.metadata:
+                return content
+            return response.message
+
         async def plan_travel(input_data, previous_results):
             """Plan Chennai-Delhi-Chennai travel"""
             logger.info("Planning Chennai-Delhi travel arrangements...")
             
-            response = await travel_agent.process(
+            response = await bounded_process(
+                travel_agent,
                 "Research and recommend flight options for 4 people:\n"
                 "1. Chennai to Delhi (Day 1 early morning)\n"
                 "2. Delhi to Chennai (Day 4 evening)\n"
@@ -103,9 +316,13 @@ async def main():
                 "- Airport transfers in both cities\n"
                 "Total trip budget: ₹50,000 for 4 people"
             )
+
+            if "error" in response.metadata:
+                return {'error': response.metadata['error']}
             
             return {
                 'content': response.message,
+                'summary': await summarize(response.message),
                 'travel_plan': response.metadata.get('travel_plan', {})
             }
 
@@ -113,9 +330,12 @@ async def main():
             """Research Golden Triangle destinations and key information"""
             logger.info("Researching Delhi, Agra, and Jaipur...")
             
-            travel_info = previous_results['travel']['content']
-            response = await researcher.process(
-                f"Based on travel arrangements: {travel_info}\n"
+            context = upstream_context(previous_results, [
+                ('travel', "Based on travel arrangements")
+            ])
+            response = await bounded_process(
+                researcher,
+                f"{context}"
                 "Research for 3-night Golden Triangle tour for 4 people with rental cab:\n"
                 "1. Must-visit monuments and attractions\n"
                 "2. Car rental services in Delhi for Golden Triangle circuit\n"
@@ -126,9 +346,13 @@ async def main():
                 "7. Toll charges and fuel costs estimation\n"
                 "Consider remaining budget after flight bookings from total ₹50,000"
             )
+
+            if "error" in response.metadata:
+                return {'error': response.metadata['error']}
             
             return {
                 'content': response.message,
+                'summary': await summarize(response.message),
                 'destinations': response.metadata.get('destinations', [])
             }
 
@@ -136,11 +360,15 @@ async def main():
             """Plan activities for 4 days within budget"""
             logger.info("Planning daily activities...")
             
-            research = previous_results['research']['content']
-            travel_info = previous_results['travel']['content']
-            response = await activity_planner.process(
-                f"Based on travel arrangements: {travel_info}\n"
-                f"And research: {research}\n"
+            context = upstream_context(previous_results, [
+                ('travel', "Based on travel arrangements"),
+                ('research', "And research")
+            ])
+            # The planner has no tools, so its itinerary can be shown as it is written
+            itinerary = io.StringIO()
+            async for chunk in bounded_stream(
+                activity_planner,
+                f"{context}"
                 "Create a detailed 4-day Golden Triangle itinerary with rental car:\n"
                 "Day 1: - Early morning flight from Chennai to Delhi\n"
                 "       - Pick up rental car from Delhi airport\n"
@@ -164,28 +392,35 @@ async def main():
                 "3. Major toll points\n"
                 "4. Fuel stops\n"
                 "5. Budget-friendly activities and costs"
-            )
-            
+            ):
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+                itinerary.write(chunk)
+            sys.stdout.write("\n")
+
+            content = itinerary.getvalue().strip()
             return {
-                'content': response.message,
-                'itinerary': response.metadata.get('itinerary', {})
+                'content': content,
+                'summary': await summarize(content),
+                'itinerary': {}
             }
 
         async def plan_logistics(input_data, previous_results):
             """Plan accommodation, transportation, and budget allocation"""
             logger.info("Planning logistics and budget...")
             
-            travel_info = previous_results['travel']['content']
-            research = previous_results['research']['content']
-            activities = previous_results['activities']['content']
+            context = upstream_context(previous_results, [
+                ('travel', "Based on travel arrangements"),
+                ('research', "Research information"),
+                ('activities', "And planned activities")
+            ])
             
             # Check weather for trip dates
             start_date = datetime.now() + timedelta(days=30)
             
-            response = await logistics_agent.process(
-                f"Based on travel arrangements: {travel_info}\n"
-                f"Research information: {research}\n"
-                f"And planned activities: {activities}\n"
+            response = await bounded_process(
+                logistics_agent,
+                f"{context}"
                 "Provide detailed logistics for 4 people, 4 days (3 nights) with rental cab:\n"
                 "1. Budget breakdown for:\n"
                 "   - Flights (Chennai-Delhi-Chennai)\n"
@@ -206,8 +441,13 @@ async def main():
                 "5. Money-saving strategies\n"
                 "6. Essential packing list\n"
                 "7. Parking and toll information\n"
-                "Total budget: ₹50,000"
+                "Total budget: ₹50,000",
+                # Coordinator step that produces the final plan goes first when queued
+                priority=1
             )
+
+            if "error" in response.metadata:
+                return {'error': response.metadata['error']}
             
             return {
                 'content': response.message,
@@ -215,7 +455,7 @@ async def main():
             }
 
         # Configure flow
-        flow = TripFlow()
+        flow = TripFlow(cache_dir=".hawkins_cache", force_steps=force_steps)
         flow.add_step('travel', plan_travel)
         flow.add_step('research', research_step, ['travel'])
         flow.add_step('activities', plan_activities, ['travel', 'research'])
@@ -231,17 +471,29 @@ async def main():
         logger.info("\nTrip Planning Results:")
         logger.info("=" * 50)
 
-        for step_name, result in results.items():
-            logger.info(f"\n{step_name.upper()}:")
-            logger.info("-" * 40)
-            if 'error' in result:
-                logger.error(f"Error in {step_name}: {result['error']}")
-            else:
-                logger.info(result['content'])
+        for step_name, outcome in results.items():
+            if outcome['status'] == SKIPPED:
+                logger.warning("%s: SKIPPED (%s)", step_name, outcome['error'])
+            elif outcome['status'] == FAILED:
+                logger.error("Error in %s: %s", step_name, outcome['error'])
+            elif logger.isEnabledFor(logging.INFO):
+                logger.info("\n%s:", step_name.upper())
+                logger.info("-" * 40)
+                logger.info(outcome['result']['content'])
 
     except Exception as e:
-        logger.error(f"Error in trip planning: {str(e)}", exc_info=True)
+        logger.error("Error in trip planning: %s", e, exc_info=True)
         raise
+    finally:
+        await http_client.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--force-step",
+        action="append",
+        default=[],
+        help="Re-run this step and everything after it instead of using cached results"
+    )
+    args = parser.parse_args()
+    run(main(force_steps=args.force_step))
@@ -4,9 +4,13 @@ from hawkins_agent import AgentBuilder
 from hawkins_agent.tools import WebSearchTool
 from hawkins_agent.mock import KnowledgeBase
 from hawkins_agent.llm import LiteLLMProvider
+from hawkins_agent.runtime import bounded_process, run
+from dotenv import load_dotenv
 import logging
 import os
-import asyncio
+
+# Load API keys from .env
+load_dotenv()
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -31,7 +35,7 @@ async def main():
         logger.info("Creating agent with GPT-4o...")
         agent = (AgentBuilder("assistant")
                 .with_model("openai/gpt-4o")  # Use latest OpenAI model
-                .with_provider(LiteLLMProvider, temperature=0.7)
+                .with_provider(LiteLLMProvider, temperature=0.7, max_tokens=1024, timeout=30, max_retries=3)
                 .with_knowledge_base(kb)
                 .with_tool(search_tool)
                 .build())
@@ -40,9 +44,9 @@ async def main():
 
         # Test query
         query = "What are the latest developments in AI technology in 2024?"
-        logger.info(f"Query: {query}")
+        logger.info("Query: %s", query)
 
-        response = await agent.process(query)
+        response = await bounded_process(agent, query)
 
         # Print response details
         logger.info("\nAgent Response:")
@@ -53,21 +57,21 @@ async def main():
             logger.info("\nTool Calls Made:")
             logger.info("-" * 40)
             for call in response.tool_calls:
-                logger.info(f"Tool: {call['name']}")
-                logger.info(f"Parameters: {call['parameters']}")
+                logger.info("Tool: %s", call['name'])
+                logger.info("Parameters: %s", call['parameters'])
 
         if "tool_results" in response.metadata:
             logger.info("\nTool Results:")
             logger.info("-" * 40)
             for result in response.metadata["tool_results"]:
                 if result["success"]:
-                    logger.info(f"Success: {result['result']}")
+                    logger.info("Success: %s", result['result'])
                 else:
-                    logger.error(f"Error: {result['error']}")
+                    logger.error("Error: %s", result['error'])
 
     except Exception as e:
-        logger.error(f"Error running simple agent: {str(e)}", exc_info=True)
+        logger.error("Error running simple agent: %s", e, exc_info=True)
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
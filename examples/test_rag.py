@@ -1,11 +1,15 @@
 """Test basic HawkinsRAG functionality"""
 
 from hawkins_rag import HawkinsRAG
-import asyncio
+from hawkins_agent.runtime import run
+from dotenv import load_dotenv
 import logging
 import tempfile
 import os
 
+# Load API keys from .env
+load_dotenv()
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,13 +30,13 @@ async def main():
         3. Focus on AI safety and ethics
         """
 
-        # Create temporary file for test content
-        logger.info("Creating test document...")
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-            temp_file.write(test_content)
-            temp_path = temp_file.name
+        # HawkinsRAG only loads from a path, so stage the text in a temp dir
+        # that is removed automatically once the test is done
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = os.path.join(temp_dir, "test_document.txt")
+            with open(temp_path, 'w') as f:
+                f.write(test_content)
 
-        try:
             # Load document
             logger.info("Loading test document...")
             rag.load_document(temp_path, source_type="text")
@@ -44,17 +48,12 @@ async def main():
 
             logger.info("\nQuery Results:")
             logger.info("-" * 40)
-            logger.info(f"Query: {query}")
-            logger.info(f"Response: {response}")
-
-        finally:
-            # Clean up temporary file
-            os.unlink(temp_path)
-            logger.info("Cleaned up temporary file")
+            logger.info("Query: %s", query)
+            logger.info("Response: %s", response)
 
     except Exception as e:
-        logger.error(f"Error in RAG test: {str(e)}", exc_info=True)
+        logger.error("Error in RAG test: %s", e, exc_info=True)
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -4,10 +4,15 @@ from hawkins_agent import AgentBuilder
 from hawkins_agent.tools import WeatherTool
 from hawkins_agent.mock import KnowledgeBase
 from hawkins_agent.llm import LiteLLMProvider
+from hawkins_agent.runtime import bounded_process, run
+from dotenv import load_dotenv
 import logging
 import os
 import asyncio
 
+# Load API keys from .env
+load_dotenv()
+
 # Set up logging with more detailed format
 logging.basicConfig(
     level=logging.INFO,
@@ -23,13 +28,13 @@ async def main():
 
         # Configure weather tool with API key
         logger.info("Initializing weather tool...")
-        weather_tool = WeatherTool(api_key="1b73fe8fc5a03431a43f83fa899d0a4d")
+        weather_tool = WeatherTool(api_key=os.environ.get("OPENWEATHERMAP_API_KEY"))
 
         # Create agent with weather tool
         logger.info("Creating agent with weather tool...")
         agent = (AgentBuilder("weather_tester")
                 .with_model("openai/gpt-4o")
-                .with_provider(LiteLLMProvider, temperature=0.7)
+                .with_provider(LiteLLMProvider, temperature=0.7, max_tokens=1024, timeout=30, max_retries=3)
                 .with_knowledge_base(kb)
                 .with_tool(weather_tool)
                 .build())
@@ -41,10 +46,18 @@ async def main():
             "What's the weather like in New York,US?"
         ]
 
-        for query in queries:
-            logger.info(f"\nProcessing query: {query}")
+        # The queries are independent single turns, so run them all at once
+        # without sharing conversation memory
+        responses = await asyncio.gather(
+            *(bounded_process(agent, query, stateless=True) for query in queries),
+            return_exceptions=True
+        )
+
+        for query, response in zip(queries, responses):
+            logger.info("\nQuery: %s", query)
             try:
-                response = await agent.process(query)
+                if isinstance(response, Exception):
+                    raise response
 
                 logger.info("\nResponse:")
                 logger.info("-" * 40)
@@ -54,8 +67,8 @@ async def main():
                     logger.info("\nTool Calls Made:")
                     logger.info("-" * 40)
                     for call in response.tool_calls:
-                        logger.info(f"Tool: {call['name']}")
-                        logger.info(f"Parameters: {call['parameters']}")
+                        logger.info("Tool: %s", call['name'])
+                        logger.info("Parameters: %s", call['parameters'])
 
                 if "tool_results" in response.metadata:
                     logger.info("\nTool Results:")
@@ -63,22 +76,30 @@ async def main():
                     for result in response.metadata["tool_results"]:
                         if result["success"]:
                             weather_data = result["result"]
-                            logger.info("Weather Information:")
-                            logger.info(f"- Temperature: {weather_data['temperature']}°C")
-                            logger.info(f"- Feels like: {weather_data['feels_like']}°C")
-                            logger.info(f"- Description: {weather_data['description']}")
-                            logger.info(f"- Humidity: {weather_data['humidity']}%")
-                            logger.info(f"- Wind Speed: {weather_data['wind_speed']} m/s")
-                            logger.info(f"- Pressure: {weather_data['pressure']} hPa")
+                            logger.info(
+                                "Weather Information:\n"
+                                "- Temperature: %s°C\n"
+                                "- Feels like: %s°C\n"
+                                "- Description: %s\n"
+                                "- Humidity: %s%%\n"
+                                "- Wind Speed: %s m/s\n"
+                                "- Pressure: %s hPa",
+                                weather_data['temperature'],
+                                weather_data['feels_like'],
+                                weather_data['description'],
+                                weather_data['humidity'],
+                                weather_data['wind_speed'],
+                                weather_data['pressure']
+                            )
                         else:
-                            logger.error(f"Error: {result['error']}")
+                            logger.error("Error: %s", result['error'])
 
             except Exception as e:
-                logger.error(f"Error processing query '{query}': {str(e)}", exc_info=True)
+                logger.error("Error processing query '%s': %s", query, e, exc_info=True)
 
     except Exception as e:
-        logger.error(f"Error in weather tool demonstration: {str(e)}", exc_info=True)
+        logger.error("Error in weather tool demonstration: %s", e, exc_info=True)
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
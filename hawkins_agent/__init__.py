@@ -7,7 +7,8 @@ from .agent import Agent, AgentBuilder
 from .types import Message, AgentResponse
 from .tools.base import BaseTool
 from .flow import FlowManager, FlowStep
+from .response_cache import SemanticCache
 
 __version__ = "0.1.4"
 __all__ = ["Agent", "AgentBuilder", "Message", "AgentResponse", "BaseTool", 
-           "FlowManager", "FlowStep"]
\ No newline at end of file
+           "FlowManager", "FlowStep", "SemanticCache"]
\ No newline at end of file
@@ -1,18 +1,31 @@
 """Core Agent implementation"""
 
-from typing import List, Optional, Dict, Any, Type, Union
+from typing import List, Optional, Dict, Any, Type, Union, AsyncIterator
 from .llm import LLMManager, BaseLLMProvider, LiteLLMProvider
 from .mock import Document, KnowledgeBase
 from .memory import MemoryManager
+from .response_cache import SemanticCache
+from .limits import get_semaphore
+from .runtime.breaker import CircuitOpenError
 from .tools.base import BaseTool
+from .tools.cache import tool_cache
 from .types import Message, AgentResponse, MessageRole, ToolResponse
-import json
+import asyncio
+import orjson
 import re
 import logging
 from dataclasses import asdict
 
 logger = logging.getLogger(__name__)
 
+# Tool calls embedded in the text of models without function calling. The
+# body may not contain a closing tag, so a malformed block never runs on
+# into the next one; the whole body is captured and decoded
+TOOL_CALL_PATTERN = re.compile(r'<tool_call>\s*(\{(?:(?!</tool_call>).)*\})\s*</tool_call>', re.DOTALL)
+
+# Rough cap on the context (recalled memories, knowledge) sent per request
+DEFAULT_MAX_CONTEXT_TOKENS = 4000
+
 class Agent:
     """Main Agent class that handles interactions and tool usage"""
 
@@ -25,7 +38,9 @@ class Agent:
         knowledge_base: Optional[KnowledgeBase] = None,
         tools: Optional[List[BaseTool]] = None,
         memory_config: Optional[Dict[str, Any]] = None,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        response_cache: Optional[SemanticCache] = None,
+        max_context_tokens: Optional[int] = DEFAULT_MAX_CONTEXT_TOKENS
     ):
         self.name = name
         self.llm = LLMManager(
@@ -34,9 +49,55 @@ class Agent:
             **llm_config or {}
         )
         self.knowledge_base = knowledge_base
-        self.tools = tools or []
+        self.tools = list(tools or [])
+        self._refresh_tools()
         self.memory = MemoryManager(config=memory_config)
+        self._custom_system_prompt = system_prompt is not None
         self.system_prompt = system_prompt or self._get_default_system_prompt()
+        self.response_cache = response_cache
+        self.max_context_tokens = max_context_tokens
+
+    @property
+    def system_prompt(self) -> str:
+        """System prompt sent at the start of every request"""
+        return self._system_message.content
+
+    @system_prompt.setter
+    def system_prompt(self, prompt: str) -> None:
+        # Messages are immutable, so one system message is shared by every request
+        self._system_message = Message(role=MessageRole.SYSTEM, content=prompt)
+
+    def _refresh_tools(self) -> None:
+        """Rebuild the lookup map, descriptions and schemas derived from self.tools
+
+        These are fixed between tool changes, so they are built here once
+        instead of on every request.
+        """
+        # The first tool registered under a name wins
+        self._tool_map: Dict[str, BaseTool] = {tool.name: tool for tool in reversed(self.tools)}
+        self._tool_descriptions = "\n".join(
+            f"- {tool.name}: {tool.description}"
+            for tool in self.tools
+        )
+        self._formatted_tools = [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.parameters
+            }
+            for tool in self.tools
+        ]
+
+    def add_tool(self, tool: BaseTool) -> None:
+        """Add a tool after the agent has been built
+
+        Args:
+            tool: Tool to make available to the agent
+        """
+        self.tools.append(tool)
+        self._refresh_tools()
+        if not self._custom_system_prompt:
+            self.system_prompt = self._get_default_system_prompt()
 
     async def _handle_tool_results(
         self,
@@ -70,117 +131,188 @@ class Agent:
             return None
 
     async def process(self, message: str, context: Optional[Dict[str, Any]] = None) -> AgentResponse:
-        """Process a user message"""
+        """Process a user message
+
+        With a response cache, a message similar enough to an earlier one is
+        answered from the cache without calling the LLM. Messages sent with
+        extra context bypass the cache.
+
+        Raises:
+            CircuitOpenError: If the LLM provider's circuit is open
+        """
         try:
-            # Get context and construct messages
-            combined_context = await self._gather_context(message)
-            if context:
-                combined_context.update(context)
-
-            # Format messages list with system prompt and context
-            messages = [Message(role=MessageRole.SYSTEM, content=self.system_prompt)]
-
-            # Add context if available
-            if combined_context:
-                context_msg = "Context:\n" + "\n".join([
-                    f"- {k}: {v}" for k, v in combined_context.items()
-                ])
-                messages.append(Message(
-                    role=MessageRole.SYSTEM,
-                    content=context_msg
-                ))
-
-            messages.append(Message(role=MessageRole.USER, content=message))
-
-            # Format tools for LLM
-            formatted_tools = []
-            if self.tools:
-                for tool in self.tools:
-                    formatted_tools.append({
-                        "name": tool.name,
-                        "description": tool.description,
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "query": {
-                                    "type": "string", 
-                                    "description": "The query or parameters for the tool"
-                                }
-                            },
-                            "required": ["query"]
-                        }
-                    })
-
-            # Get LLM response
-            response = await self.llm.generate_response(
-                messages=messages,
-                tools=formatted_tools if self.tools else None
-            )
+            result = None
+            embedding = None
+            if self.response_cache and not context:
+                embedding = await self.response_cache.embed(message)
+                result = self.response_cache.get(embedding)
+
+            if result is None:
+                messages = await self._build_messages(message, context)
+                result = await self._run(message, messages)
 
-            # Parse response and handle tool calls
-            result = await self._process_response(response, message)
+                # Tool results (weather, search) go stale, so only cache plain answers
+                if embedding is not None and not result.tool_calls and "error" not in result.metadata:
+                    self.response_cache.put(embedding, result)
 
             # Update memory if we have a valid message
-            if result and result.message:
+            if result.message and "error" not in result.metadata:
                 await self.memory.add_interaction(message, result.message)
 
-            return result or AgentResponse(
-                message="Error processing response",
-                tool_calls=[],
-                metadata={"error": "Failed to process response"}
-            )
+            return result
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
-            logger.error(f"Error processing message: {str(e)}")
+            return self._error_response(e)
+
+    async def stateless_process(
+        self,
+        message: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> AgentResponse:
+        """Process a user message as a single independent turn
+
+        Memory is neither recalled nor updated, so the prompt is always just
+        the system prompt, context and message, and concurrent calls on the
+        same agent cannot see each other.
+
+        Args:
+            message: User message to process
+            context: Optional additional context
+
+        Returns:
+            The agent's response
+
+        Raises:
+            CircuitOpenError: If the LLM provider's circuit is open
+        """
+        try:
+            messages = await self._build_messages(message, context, use_memory=False)
+            return await self._run(message, messages)
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            return self._error_response(e)
+
+    async def _run(self, message: str, messages: List[Message]) -> AgentResponse:
+        """Send prepared messages to the LLM and handle any tool calls"""
+        if self.tools and not self.llm.provider.supports_functions:
+            return await self._stream_and_dispatch(message, messages)
+
+        # Get LLM response
+        response = await self.llm.generate_response(
+            messages=messages,
+            tools=self._formatted_tools or None
+        )
+
+        # Parse response and handle tool calls
+        result = await self._process_response(response, message)
+
+        return result or AgentResponse(
+            message="Error processing response",
+            tool_calls=[],
+            metadata={"error": "Failed to process response"}
+        )
+
+    def _error_response(self, error: Exception) -> AgentResponse:
+        """Build the response returned when processing a message fails"""
+        logger.error(f"Error processing message: {str(error)}")
+        return AgentResponse(
+            message=f"I encountered an error processing your message: {str(error)}",
+            tool_calls=[],
+            metadata={"error": str(error)}
+        )
+
+    async def process_stream(
+        self,
+        message: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Process a user message, yielding the response as it is generated
+
+        Tools are not offered to the model when streaming; use process
+        when the agent needs to call tools.
+
+        Args:
+            message: User message to process
+            context: Optional additional context
+
+        Yields:
+            Chunks of the response text
+
+        Raises:
+            Exception: Whatever stopped the request, so a failure is not
+                mistaken for part of the response
+        """
+        chunks = []
+        try:
+            messages = await self._build_messages(message, context)
+            async for chunk in self.llm.generate_stream(messages):
+                chunks.append(chunk)
+                yield chunk
+
+        except Exception as e:
+            logger.error(f"Error streaming message: {str(e)}")
+            raise
+
+        # Update memory once the full response is known
+        response = "".join(chunks).strip()
+        if response:
+            await self.memory.add_interaction(message, response)
+
+    async def process_batch(
+        self,
+        messages: List[str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[AgentResponse]:
+        """Process several independent user messages concurrently
+
+        Args:
+            messages: User messages to process
+            context: Optional context shared by every message
+
+        Returns:
+            One AgentResponse per message, in the same order
+        """
+        return list(await asyncio.gather(
+            *(self.process(message, context=context) for message in messages)
+        ))
+
+    async def _process_response(self, response: Dict[str, Any], original_message: str) -> AgentResponse:
+        """Process the LLM response and handle tool calls"""
+        if "error" in response:
+            # The request itself failed; the content only describes the error
             return AgentResponse(
-                message=f"I encountered an error processing your message: {str(e)}",
+                message=response.get("content", ""),
                 tool_calls=[],
-                metadata={"error": str(e)}
+                metadata={"error": response["error"]}
             )
 
-    async def _process_response(self, response: Dict[str, Any], original_message: str) -> AgentResponse:
-        """Process the LLM response and handle tool calls"""
         try:
             message = response.get("content", "") or ""
             tool_calls = []
-            metadata = {}
 
             # Extract tool calls from the message for non-function-calling models
             if not self.llm.provider.supports_functions:
-                tool_call_pattern = r'<tool_call>\s*({[^}]+})\s*</tool_call>'
-                matches = re.finditer(tool_call_pattern, message)
-
-                for match in matches:
+                def extract(match: "re.Match[str]") -> str:
                     try:
-                        tool_call = json.loads(match.group(1))
-                        tool_calls.append(tool_call)
-                        # Remove the tool call from the message
-                        message = message.replace(match.group(0), "")
-                    except json.JSONDecodeError as e:
+                        tool_calls.append(orjson.loads(match.group(1)))
+                    except orjson.JSONDecodeError as e:
                         logger.error(f"Error parsing tool call JSON: {e}")
+                        return match.group(0)
+                    # Remove the tool call from the message
+                    return ""
+
+                message = TOOL_CALL_PATTERN.sub(extract, message)
             else:
                 # Use standard function calling response format
                 tool_calls = response.get("tool_calls", [])
 
             # Execute tools and get results if any tool calls present
-            if tool_calls:
-                tool_results = await self._execute_tools(tool_calls)
-                metadata["tool_results"] = tool_results
-
-                # Generate follow-up based on tool results
-                if any(result.get("success", False) for result in tool_results):
-                    follow_up = await self._handle_tool_results(
-                        tool_results, 
-                        message
-                    )
-                    if follow_up:
-                        message = (message or "").strip() + "\n\n" + follow_up
-
-            return AgentResponse(
-                message=message.strip(),
-                tool_calls=tool_calls,
-                metadata=metadata
-            )
+            tool_results = await self._execute_tools(tool_calls) if tool_calls else None
+            return await self._complete_response(message, tool_calls, tool_results)
 
         except Exception as e:
             logger.error(f"Error processing response: {str(e)}")
@@ -190,69 +322,246 @@ class Agent:
                 metadata={"error": str(e)}
             )
 
-    async def _gather_context(self, message: str) -> Dict[str, Any]:
-        """Gather context from memory and knowledge base"""
-        context = {}
+    async def _complete_response(
+        self,
+        message: str,
+        tool_calls: List[Dict[str, Any]],
+        tool_results: Optional[List[Dict[str, Any]]]
+    ) -> AgentResponse:
+        """Add tool results and a follow-up summary of them to a response"""
+        metadata = {}
+        if tool_results is not None:
+            metadata["tool_results"] = tool_results
+
+            successful = [result for result in tool_results if result.get("success", False)]
+            if any(self._tool_map[result["tool"]].needs_summary for result in successful):
+                # Generate follow-up based on tool results
+                follow_up = await self._handle_tool_results(
+                    tool_results, 
+                    message
+                )
+                if follow_up:
+                    message = (message or "").strip() + "\n\n" + follow_up
+            elif successful:
+                # The results already read as answers, skip the extra LLM call
+                message = (message or "").strip() + "\n\n" + "\n".join(
+                    f"- {result['result']}" for result in successful
+                )
+
+        return AgentResponse(
+            message=message.strip(),
+            tool_calls=tool_calls,
+            metadata=metadata
+        )
+
+    async def _stream_and_dispatch(self, message: str, messages: List[Message]) -> AgentResponse:
+        """Stream a response, starting each text tool call as soon as it is complete
+
+        Used for models without function calling, whose tool calls arrive as
+        <tool_call> blocks in the text. Tools run while the rest of the
+        response is still being generated.
+        """
+        buffer = ""
+        scanned = 0
+        tool_calls = []
+        call_spans = []
+        pending = []
+        started = {}
+        closing_tag = "</tool_call>"
 
         try:
-            # Get relevant memories if available
-            memories = await self.memory.get_relevant_memories(message)
-            if memories:
-                context["memory"] = memories
+            async for chunk in self.llm.generate_response_stream(messages, tools=self._formatted_tools):
+                buffer += chunk
+                # Only look for blocks once a closing tag may have arrived
+                if closing_tag not in buffer[max(scanned, len(buffer) - len(chunk) - len(closing_tag)):]:
+                    continue
+                for match in TOOL_CALL_PATTERN.finditer(buffer, scanned):
+                    scanned = match.end()
+                    try:
+                        call = orjson.loads(match.group(1))
+                    except orjson.JSONDecodeError as e:
+                        logger.error(f"Error parsing tool call JSON: {e}")
+                        continue
+                    tool_calls.append(call)
+                    call_spans.append(match.span())
+                    # A repeated call shares the task started for the first one
+                    key = self._call_key(call)
+                    if key not in started:
+                        started[key] = asyncio.create_task(self._execute_tools([call]))
+                    pending.append(started[key])
+
+            tool_results = None
+            if pending:
+                tool_results = [
+                    result
+                    for results in await asyncio.gather(*pending)
+                    for result in results
+                ]
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+        # Remove the parsed tool calls from the message
+        parts = []
+        start = 0
+        for span_start, span_end in call_spans:
+            parts.append(buffer[start:span_start])
+            start = span_end
+        parts.append(buffer[start:])
+
+        return await self._complete_response("".join(parts), tool_calls, tool_results)
+
+    async def _build_messages(
+        self,
+        message: str,
+        context: Optional[Dict[str, Any]] = None,
+        use_memory: bool = True
+    ) -> List[Message]:
+        """Construct the system, context and user messages for a request"""
+        # Get context and construct messages
+        combined_context = await self._gather_context(message, use_memory)
+        # Only gathered entries may be dropped to fit the context limit
+        recalled = [key for key in combined_context if key not in (context or {})]
+        if context:
+            combined_context.update(context)
+
+        # Format messages list with system prompt and context
+        messages = [self._system_message]
+
+        # Add context if available
+        if combined_context:
+            messages.append(Message(
+                role=MessageRole.SYSTEM,
+                content=self._format_context(combined_context, recalled)
+            ))
+
+        messages.append(Message(role=MessageRole.USER, content=message))
+        return messages
+
+    def _format_context(self, context: Dict[str, Any], recalled: List[str]) -> str:
+        """Render context for the prompt within max_context_tokens
+
+        The last recalled memories are dropped first, then the last
+        knowledge results, so prompt size stays bounded however much the
+        agent remembers. Keys not in recalled, such as context passed to
+        process, are always sent in full.
+        """
+        def render(items: Dict[str, Any]) -> str:
+            return "Context:\n" + "\n".join(f"- {k}: {v}" for k, v in items.items())
+
+        context_msg = render(context)
+        if self.max_context_tokens is None:
+            return context_msg
+
+        # About four characters per token, as in runtime.estimate_tokens
+        budget = self.max_context_tokens * 4
+        context = dict(context)
+        for key in ("memory", "knowledge"):
+            entries = context.get(key)
+            if key not in recalled or not isinstance(entries, list):
+                continue
+            entries = list(entries)
+            while len(context_msg) > budget and entries:
+                # Memory search ranks its results, so the last is the least
+                # relevant; knowledge results keep the order the knowledge
+                # base returned them in
+                entries.pop()
+                if entries:
+                    context[key] = entries
+                else:
+                    del context[key]
+                context_msg = render(context)
 
-            # Query knowledge base if available
-            if self.knowledge_base:
-                kb_results = await self.knowledge_base.query(message)
-                if kb_results:
-                    context["knowledge"] = kb_results
+        return context_msg
 
-        except Exception as e:
-            logger.error(f"Error gathering context: {str(e)}")
+    async def _gather_context(self, message: str, use_memory: bool = True) -> Dict[str, Any]:
+        """Gather context from memory and knowledge base concurrently"""
+        context = {}
+        sources = {}
+
+        # Get relevant memories if available
+        if use_memory:
+            sources["memory"] = self.memory.get_relevant_memories(message)
+
+        # Query knowledge base if available
+        if self.knowledge_base:
+            sources["knowledge"] = self.knowledge_base.query(message)
+
+        # A failing source must not cancel the other one
+        results = await asyncio.gather(*sources.values(), return_exceptions=True)
+        for key, result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error gathering context: {str(result)}")
+            elif result:
+                context[key] = result
 
         return context
 
     async def _execute_tools(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Execute tool calls and return results"""
-        results = []
-
-        for call in tool_calls:
+        """Execute tool calls concurrently and return results in call order"""
+        async def run_one(call: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             tool_name = call.get("name")
             parameters = call.get("parameters", {})
 
             # Find matching tool
-            tool = next(
-                (t for t in self.tools if t.name == tool_name), 
-                None
-            )
-
-            if tool:
-                try:
-                    result = await tool.execute(**parameters)
-                    if isinstance(result, ToolResponse):
-                        results.append({
-                            "tool": tool_name,
-                            "success": result.success,
-                            "result": result.result,
-                            "error": result.error
-                        })
-                    else:
-                        logger.warning(f"Tool {tool_name} returned invalid response type")
-                        results.append({
-                            "tool": tool_name,
-                            "success": False,
-                            "result": None,
-                            "error": "Invalid tool response format"
-                        })
-                except Exception as e:
-                    logger.error(f"Error executing tool {tool_name}: {str(e)}")
-                    results.append({
+            tool = self._tool_map.get(tool_name)
+            if not tool:
+                return None
+
+            try:
+                result = tool_cache.get(tool.name, parameters) if tool.cache_ttl else None
+                if result is None:
+                    async with get_semaphore(tool.name):
+                        result = await tool.execute(**parameters)
+                    if tool.cache_ttl and isinstance(result, ToolResponse) and result.success:
+                        tool_cache.put(tool.name, parameters, result, tool.cache_ttl)
+                if isinstance(result, ToolResponse):
+                    return {
                         "tool": tool_name,
-                        "success": False,
-                        "result": None,
-                        "error": str(e)
-                    })
-
-        return results
+                        "success": result.success,
+                        "result": result.result,
+                        "error": result.error
+                    }
+                logger.warning(f"Tool {tool_name} returned invalid response type")
+                return {
+                    "tool": tool_name,
+                    "success": False,
+                    "result": None,
+                    "error": "Invalid tool response format"
+                }
+            except Exception as e:
+                logger.error(f"Error executing tool {tool_name}: {str(e)}")
+                return {
+                    "tool": tool_name,
+                    "success": False,
+                    "result": None,
+                    "error": str(e)
+                }
+
+        # Models sometimes repeat a call verbatim; run each distinct call once
+        # and give every repeat the same result
+        slots = {}
+        unique_calls = []
+        for call in tool_calls:
+            key = self._call_key(call)
+            if key not in slots:
+                slots[key] = len(unique_calls)
+                unique_calls.append(call)
+
+        unique_results = await asyncio.gather(*(run_one(call) for call in unique_calls))
+        results = [unique_results[slots[self._call_key(call)]] for call in tool_calls]
+        # Calls to unknown tools are dropped, as before
+        return [result for result in results if result is not None]
+
+    @staticmethod
+    def _call_key(call: Dict[str, Any]) -> bytes:
+        """Identify a tool call by its name and canonicalized parameters"""
+        return orjson.dumps(
+            [call.get("name"), call.get("parameters", {})],
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        )
 
     def _get_default_system_prompt(self) -> str:
         """Get the default system prompt for the agent"""
@@ -261,24 +570,19 @@ class Agent:
         if not self.tools:
             return base_prompt
 
-        tool_descriptions = "\n".join(
-            f"- {tool.name}: {tool.description}" 
-            for tool in self.tools
-        )
-
         # Adjust prompt based on whether the model supports function calling
         if self.llm.provider.supports_functions:
-            return f"{base_prompt}\n\nYou have access to the following tools:\n\n{tool_descriptions}"
+            return f"{base_prompt}\n\nYou have access to the following tools:\n\n{self._tool_descriptions}"
         else:
             return f"""{base_prompt}
 
             You have access to the following tools:
-            {tool_descriptions}
+            {self._tool_descriptions}
             
             When you need to use a tool, please use the exact format defined by each tool's schema:
             
             <tool_call>
-            {"name": "tool_name", "parameters": {"parameter1": "value1", "parameter2": "value2"}}
+            {{"name": "tool_name", "parameters": {{"parameter1": "value1", "parameter2": "value2"}}}}
             </tool_call>
             
             Important guidelines:
@@ -290,7 +594,7 @@ class Agent:
             
             If a tool description does not specify any parameters, use this fallback format:
             <tool_call>
-            {"name": "tool_name", "parameters": {"query": "your query"}}
+            {{"name": "tool_name", "parameters": {{"query": "your query"}}}}
             </tool_call>
             
             After receiving results from a tool, interpret the output and incorporate it into your response.
@@ -307,6 +611,8 @@ class AgentBuilder:
         self.tools = []
         self.memory_config = {}
         self.llm_config = {}
+        self.response_cache = None
+        self.max_context_tokens = DEFAULT_MAX_CONTEXT_TOKENS
 
     def with_model(self, model: str) -> "AgentBuilder":
         """Set the LLM model"""
@@ -334,6 +640,16 @@ class AgentBuilder:
         self.memory_config = config
         return self
 
+    def with_response_cache(self, cache: SemanticCache) -> "AgentBuilder":
+        """Answer messages similar to earlier ones from a semantic cache"""
+        self.response_cache = cache
+        return self
+
+    def with_context_limit(self, max_tokens: Optional[int]) -> "AgentBuilder":
+        """Cap the context sent per request, or None for no limit"""
+        self.max_context_tokens = max_tokens
+        return self
+
     def build(self) -> Agent:
         """Create the agent instance"""
         return Agent(
@@ -343,5 +659,7 @@ class AgentBuilder:
             llm_config=self.llm_config,
             knowledge_base=self.knowledge_base,
             tools=self.tools,
-            memory_config=self.memory_config
+            memory_config=self.memory_config,
+            response_cache=self.response_cache,
+            max_context_tokens=self.max_context_tokens
         )
@@ -2,6 +2,7 @@
 
 from typing import Dict, List, Any, Optional, Callable, Awaitable
 from dataclasses import dataclass
+import asyncio
 import logging
 from .agent import Agent
 from .types import AgentResponse
@@ -36,6 +37,11 @@ class FlowManager:
         """Initialize the flow manager"""
         self.steps: Dict[str, FlowStep] = {}
         self.results: Dict[str, Dict[str, Any]] = {}
+        # Compiled dependency graph, indexed by integer step id
+        self._order: List[str] = []
+        self._requires_count: List[int] = []
+        self._dependents: List[List[int]] = []
+        self._compiled = False
         
     def add_step(self, step: FlowStep) -> "FlowManager":
         """Add a step to the workflow
@@ -47,11 +53,36 @@ class FlowManager:
             Self for chaining
         """
         self.steps[step.name] = step
+        self._compiled = False
         return self
+
+    def _compile(self) -> None:
+        """Build the dependency graph used by execute
+
+        Raises:
+            ValueError: If a step requires an unknown step
+        """
+        self._order = list(self.steps)
+        ids = {name: step_id for step_id, name in enumerate(self._order)}
+        self._requires_count = []
+        self._dependents = [[] for _ in self._order]
+
+        for step_id, name in enumerate(self._order):
+            requires = self.steps[name].requires or []
+            for required in requires:
+                if required not in ids:
+                    raise ValueError(f"Step {name} requires unknown step {required}")
+                self._dependents[ids[required]].append(step_id)
+            self._requires_count.append(len(requires))
+
+        self._compiled = True
         
     async def execute(self, initial_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute the complete workflow
         
+        Each step starts as soon as all of its required steps have
+        completed, so independent steps run concurrently.
+        
         Args:
             initial_data: Initial data to pass to the first step
             
@@ -59,38 +90,50 @@ class FlowManager:
             Combined results from all steps
         """
         try:
+            if not self._compiled:
+                self._compile()
+
             self.results = {}
             data = initial_data or {}
+            remaining = list(self._requires_count)
+            ready = [step_id for step_id, count in enumerate(remaining) if count == 0]
+            inflight: Dict[asyncio.Future, int] = {}
             
-            # Find steps with no dependencies
-            available = [
-                name for name, step in self.steps.items()
-                if not step.requires
-            ]
-            
-            while available:
-                # Execute available steps
-                for step_name in available[:]:
-                    step = self.steps[step_name]
-                    
-                    try:
+            try:
+                while ready or inflight:
+                    # Start every step whose requirements are met
+                    for step_id in ready:
+                        step_name = self._order[step_id]
                         logger.info(f"Executing step: {step_name}")
-                        result = await step.process(data)
+                        task = asyncio.ensure_future(self.steps[step_name].process(data))
+                        inflight[task] = step_id
+                    ready = []
+
+                    done, _ = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        step_id = inflight.pop(task)
+                        step_name = self._order[step_id]
+                        try:
+                            result = task.result()
+                        except Exception as e:
+                            logger.error(f"Error in step {step_name}: {str(e)}")
+                            raise
+
                         self.results[step_name] = result
                         data.update(result)
-                        available.remove(step_name)
-                        
-                    except Exception as e:
-                        logger.error(f"Error in step {step_name}: {str(e)}")
-                        raise
-                        
-                # Find newly available steps
-                for name, step in self.steps.items():
-                    if (name not in self.results and  # Not completed
-                        name not in available and    # Not already queued
-                        step.requires and           # Has dependencies
-                        all(req in self.results for req in step.requires)):  # All deps met
-                        available.append(name)
+
+                        # Release steps that were only waiting on this one
+                        for dependent in self._dependents[step_id]:
+                            remaining[dependent] -= 1
+                            if remaining[dependent] == 0:
+                                ready.append(dependent)
+            finally:
+                for task in inflight:
+                    task.cancel()
+
+            if len(self.results) < len(self._order):
+                blocked = [name for name in self._order if name not in self.results]
+                raise ValueError(f"Circular dependency between steps: {', '.join(blocked)}")
                         
             return self.results
             
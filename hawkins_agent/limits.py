@@ -0,0 +1,66 @@
+"""Concurrency limits for outbound LLM and tool calls
+
+Every LiteLLM request and tool execution acquires a semaphore named after
+its provider or tool, so many agents running concurrently apply
+backpressure instead of tripping provider rate limits.
+
+Example:
+    >>> from hawkins_agent.limits import set_limit
+    >>> set_limit("openai", 16)
+"""
+
+from typing import Dict
+import asyncio
+import weakref
+
+# Maximum concurrent calls per provider or tool name
+LIMITS: Dict[str, int] = {
+    "openai": 8,
+    "anthropic": 4,
+    "web_search": 2,
+}
+DEFAULT_LIMIT = 8
+
+# Semaphores belong to the event loop they are used on
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def set_limit(name: str, limit: int) -> None:
+    """Set the maximum number of concurrent calls for a provider or tool
+
+    Args:
+        name: Provider name (e.g. "openai") or tool name (e.g. "web_search")
+        limit: Maximum number of calls in flight at once
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    LIMITS[name] = limit
+    for semaphores in _semaphores.values():
+        semaphores.pop(name, None)
+
+def get_semaphore(name: str) -> asyncio.Semaphore:
+    """Get the semaphore guarding calls to a provider or tool
+
+    Args:
+        name: Provider or tool name
+
+    Returns:
+        Semaphore for the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.setdefault(loop, {})
+    if name not in semaphores:
+        semaphores[name] = asyncio.Semaphore(LIMITS.get(name, DEFAULT_LIMIT))
+    return semaphores[name]
+
+def provider_name(model: str) -> str:
+    """Derive the provider name from a LiteLLM model string
+
+    Args:
+        model: Model name such as "anthropic/claude-3-sonnet" or "gpt-4o"
+
+    Returns:
+        The provider prefix, or "openai" for unprefixed model names
+    """
+    return model.split("/", 1)[0] if "/" in model else "openai"
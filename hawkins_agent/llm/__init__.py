@@ -6,7 +6,8 @@ including response parsing, error handling, and prompt management.
 """
 
 from .base import BaseLLMProvider
-from .lite_llm import LiteLLMProvider
+from .lite_llm import LiteLLMProvider, create_router_from_env
 from .manager import LLMManager
+from ..runtime.http import create_http_client
 
-__all__ = ["BaseLLMProvider", "LiteLLMProvider", "LLMManager"]
+__all__ = ["BaseLLMProvider", "LiteLLMProvider", "LLMManager", "create_http_client", "create_router_from_env"]
@@ -1,7 +1,7 @@
 """Base classes for LLM integration"""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
 from ..types import Message
 
 class BaseLLMProvider(ABC):
@@ -35,6 +35,21 @@ class BaseLLMProvider(ABC):
             LLMError: If there's an error during generation
         """
         pass
+
+    async def generate_stream(self, messages: List[Message]) -> AsyncIterator[str]:
+        """Generate a response incrementally
+        
+        Providers that support streaming should override this. The default
+        yields the complete response from generate as a single chunk.
+        
+        Args:
+            messages: List of conversation messages
+            
+        Yields:
+            Chunks of generated response text
+        """
+        response = await self.generate(messages)
+        yield response.get("content", "") if isinstance(response, dict) else response
     
     @abstractmethod
     async def validate_response(self, response: str) -> bool:
@@ -1,35 +1,117 @@
 """LiteLLM provider implementation"""
 
-from typing import List, Optional, Dict, Any
-import json
+from typing import List, Optional, Dict, Any, AsyncIterator
+import hashlib
 import logging
-from litellm import acompletion
+import orjson
+import os
+import httpx
+import litellm
+from litellm import Router, acompletion
 from .base import BaseLLMProvider
+from ..limits import get_semaphore, provider_name
+from ..runtime.breaker import CircuitOpenError, get_breaker
+from ..runtime.coalesce import SingleFlight
+from ..runtime.limiter import RateLimiter, estimate_tokens
 from ..types import Message, MessageRole, ToolResponse
 
 logger = logging.getLogger(__name__)
 
+# Provider settings forwarded to every litellm request when configured
+REQUEST_LIMIT_KEYS = ("max_tokens", "timeout", "max_retries")
+
+# JSON router configuration used to spread calls across keys/endpoints
+ROUTER_CONFIG_ENV = "HAWKINS_LLM_ROUTER_CONFIG"
+
+_default_router: Optional[Router] = None
+
+# Requests still waiting for a response, by request hash
+_inflight = SingleFlight()
+
+def create_router_from_env() -> Optional[Router]:
+    """Create a litellm Router from the HAWKINS_LLM_ROUTER_CONFIG variable
+
+    The variable holds JSON that is either a litellm model_list or an object
+    with "model_list" and optional Router settings such as
+    "routing_strategy". Deployments sharing a model_name (for example the
+    same model under several API keys) are load balanced.
+
+    Returns:
+        A Router shared by every provider, or None if the variable is unset
+    """
+    global _default_router
+    if _default_router is None:
+        config = os.getenv(ROUTER_CONFIG_ENV)
+        if not config:
+            return None
+
+        settings = orjson.loads(config)
+        if isinstance(settings, list):
+            settings = {"model_list": settings}
+        settings.setdefault("routing_strategy", "least-busy")
+        _default_router = Router(**settings)
+        logger.info("Routing LiteLLM calls across %d deployments", len(settings['model_list']))
+    return _default_router
+
 class LiteLLMProvider(BaseLLMProvider):
     """LiteLLM integration for language model access"""
 
-    def __init__(self, model: str, **kwargs):
-        """Initialize LiteLLM provider"""
+    def __init__(self,
+                 model: str,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 router: Optional[Router] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 **kwargs):
+        """Initialize LiteLLM provider
+
+        Args:
+            model: Name of the language model to use
+            http_client: Optional shared client (see create_http_client).
+                LiteLLM keeps a single async session per process, so the
+                client is reused by every provider and connections stay warm
+                across requests. Its connections are tied to one event loop,
+                so only pass a client created for the loop the agents run on.
+                Without one, LiteLLM manages its own connections.
+            router: Optional litellm Router to send requests through. Defaults
+                to the router configured by HAWKINS_LLM_ROUTER_CONFIG, if any.
+            rate_limiter: Optional RateLimiter, usually shared by every
+                provider using the same API key, that delays requests
+                instead of letting them hit the provider's rate limits.
+            **kwargs: Additional provider configuration such as temperature,
+                max_tokens, timeout (seconds) and max_retries
+        """
         super().__init__(model, **kwargs)
         self.default_model = "openai/gpt-4o"
         self.config = kwargs
         self.supports_functions = not model.startswith("anthropic/")
+        self.http_client = http_client
+        self.rate_limiter = rate_limiter
+        if http_client is not None:
+            litellm.aclient_session = http_client
+        elif getattr(litellm.aclient_session, "is_closed", False):
+            # An earlier program's client was closed along with its loop
+            litellm.aclient_session = None
+
+        # Only route models the router has deployments for
+        router = router or create_router_from_env()
+        model_name = model or self.default_model
+        if router is not None and model_name in router.get_model_names():
+            self._acompletion = router.acompletion
+        else:
+            self._acompletion = acompletion
 
     async def generate(self, messages: List[Message], tools: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """Generate a response using litellm"""
         try:
             formatted_messages = self._format_messages_for_litellm(messages)
-            logger.info(f"Sending request to LiteLLM with model: {self.model or self.default_model}")
-            logger.debug(f"Using tools: {tools}")
+            logger.info("Sending request to LiteLLM with model: %s", self.model or self.default_model)
+            logger.debug("Using tools: %s", tools)
 
             request_params = {
                 "model": self.model or self.default_model,
                 "messages": formatted_messages,
-                "temperature": self.config.get('temperature', 0.7)
+                "temperature": self.config.get('temperature', 0.7),
+                **self._request_limits()
             }
 
             # Only add function calling for supported models
@@ -37,10 +119,10 @@ class LiteLLMProvider(BaseLLMProvider):
                 request_params["functions"] = tools
                 request_params["function_call"] = "auto"
 
-            logger.debug(f"Request parameters: {json.dumps(request_params, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Request parameters: %s", orjson.dumps(request_params, option=orjson.OPT_INDENT_2, default=str).decode())
 
-            # Use acompletion for async support
-            response = await acompletion(**request_params)
+            response = await self._complete_once(request_params)
 
             if not response or not hasattr(response, 'choices') or not response.choices:
                 logger.error("Invalid response format from LiteLLM")
@@ -63,35 +145,121 @@ class LiteLLMProvider(BaseLLMProvider):
                     try:
                         result["tool_calls"] = [{
                             "name": message.function_call.name,
-                            "parameters": json.loads(message.function_call.arguments)
+                            "parameters": orjson.loads(message.function_call.arguments)
                         }]
-                    except (AttributeError, json.JSONDecodeError) as e:
-                        logger.error(f"Error parsing function call: {e}")
+                    except (AttributeError, orjson.JSONDecodeError) as e:
+                        logger.error("Error parsing function call: %s", e)
 
                 elif hasattr(message, 'tool_calls') and message.tool_calls:
                     try:
                         result["tool_calls"] = [
                             {
                                 "name": tool_call.function.name,
-                                "parameters": json.loads(tool_call.function.arguments)
+                                "parameters": orjson.loads(tool_call.function.arguments)
                             }
                             for tool_call in message.tool_calls
                             if hasattr(tool_call, 'function')
                         ]
-                    except (AttributeError, json.JSONDecodeError) as e:
-                        logger.error(f"Error parsing tool calls: {e}")
+                    except (AttributeError, orjson.JSONDecodeError) as e:
+                        logger.error("Error parsing tool calls: %s", e)
 
             logger.info("Successfully generated response from LiteLLM")
-            logger.debug(f"Response: {json.dumps(result, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response: %s", orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str).decode())
             return result
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
-            logger.error(f"Error generating response: {str(e)}")
+            logger.error("Error generating response: %s", e)
             return {
                 "content": f"Error generating response: {str(e)}",
-                "tool_calls": []
+                "tool_calls": [],
+                "error": str(e)
             }
 
+    async def generate_stream(self, messages: List[Message]) -> AsyncIterator[str]:
+        """Stream a response from litellm as it is generated
+        
+        Function calling is not used when streaming; the text is yielded
+        chunk by chunk as the provider sends it.
+        """
+        model = self.model or self.default_model
+        logger.info("Streaming request to LiteLLM with model: %s", model)
+
+        try:
+            async with get_semaphore(provider_name(model)):
+                response = await self._complete({
+                    "model": model,
+                    "messages": self._format_messages_for_litellm(messages),
+                    "temperature": self.config.get('temperature', 0.7),
+                    "stream": True,
+                    **self._request_limits()
+                })
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    content = getattr(chunk.choices[0].delta, 'content', None)
+                    if content:
+                        yield content
+        except Exception as e:
+            logger.error("Error streaming response: %s", e)
+            raise
+
+    async def _complete_once(self, request_params: Dict[str, Any]) -> Any:
+        """Call acompletion, joining an identical request that is still running
+
+        Concurrent agents asking the same thing (same model, messages,
+        tools and settings) share one provider call instead of each paying
+        for it. A caller being cancelled doesn't affect the others.
+        """
+        key = hashlib.blake2b(
+            orjson.dumps(request_params, default=str, option=orjson.OPT_SORT_KEYS),
+            digest_size=16
+        ).digest()
+        return await _inflight.run(key, lambda: self._complete_bounded(request_params))
+
+    async def _complete_bounded(self, request_params: Dict[str, Any]) -> Any:
+        """Call acompletion, bounded per provider"""
+        async with get_semaphore(provider_name(request_params["model"])):
+            return await self._complete(request_params)
+
+    def _request_limits(self) -> Dict[str, Any]:
+        """Output, timeout and retry bounds set in the provider config"""
+        return {key: self.config[key] for key in REQUEST_LIMIT_KEYS if key in self.config}
+
+    async def _complete(self, request_params: Dict[str, Any]) -> Any:
+        """Call acompletion through the provider's circuit breaker and rate limiter
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+        """
+        breaker = get_breaker(provider_name(request_params["model"]))
+        breaker.before_call()
+
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(
+                    estimate_tokens(request_params["messages"]) + self.config.get('max_tokens', 0)
+                )
+            response = await self._acompletion(**request_params)
+        except litellm.RateLimitError:
+            if self.rate_limiter is not None:
+                self.rate_limiter.record_rate_limited()
+            breaker.record_failure()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        breaker.record_success()
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_success()
+        return response
+
     async def validate_response(self, response: str) -> bool:
         """Validate response format"""
         if not response or not isinstance(response, str):
@@ -101,14 +269,12 @@ class LiteLLMProvider(BaseLLMProvider):
     def _format_messages_for_litellm(self, messages: List[Message]) -> List[Dict[str, str]]:
         """Format messages for litellm"""
         try:
-            formatted = []
-            for msg in messages:
-                formatted.append({
-                    "role": msg.role.value,
-                    "content": msg.content
-                })
-            logger.debug(f"Formatted {len(formatted)} messages for LiteLLM")
+            formatted = [
+                {"role": msg.role.value, "content": msg.content}
+                for msg in messages
+            ]
+            logger.debug("Formatted %d messages for LiteLLM", len(formatted))
             return formatted
         except Exception as e:
-            logger.error(f"Error formatting messages: {e}")
+            logger.error("Error formatting messages: %s", e)
             return [{"role": "user", "content": "Error formatting messages"}]
\ No newline at end of file
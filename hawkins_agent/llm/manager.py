@@ -1,14 +1,27 @@
 """LLM Manager implementation"""
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 import logging
-import json
+import orjson
 from .base import BaseLLMProvider
 from .lite_llm import LiteLLMProvider
+from ..runtime.breaker import CircuitOpenError
 from ..types import Message, MessageRole
 
 logger = logging.getLogger(__name__)
 
+# Schema for tools that don't describe their own parameters
+DEFAULT_TOOL_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "string",
+            "description": "The query to be processed by the tool"
+        }
+    },
+    "required": ["query"]
+}
+
 class LLMManager:
     """Manages LLM interactions and providers"""
 
@@ -20,45 +33,48 @@ class LLMManager:
         self.model = model
         provider_class = provider_class or LiteLLMProvider
         self.provider = provider_class(model=model, **kwargs)
+        # Tools list last formatted, with its formatted tools and system message
+        self._tools_cache: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Message]] = None
 
-    async def generate_response(self,
-                             messages: List[Message],
-                             tools: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
-        """Generate a response from the LLM with optional tool support"""
-        try:
-            logger.info("Starting response generation")
-            logger.debug(f"Input messages: {messages}")
-            logger.debug(f"Available tools: {tools}")
-
-            # Format tools for OpenAI function calling format
-            formatted_tools = None
-            if tools:
-                formatted_tools = []
-                for tool in tools:
-                    formatted_tool = {
-                        "name": tool["name"],
-                        "description": tool["description"],
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "query": {
-                                    "type": "string",
-                                    "description": "The query to be processed by the tool"
-                                }
-                            },
-                            "required": ["query"]
-                        }
-                    }
-                    formatted_tools.append(formatted_tool)
-                logger.debug(f"Formatted tools: {json.dumps(formatted_tools, indent=2)}")
-
-            # Add system prompt if tools are provided
-            if formatted_tools:
-                tool_descriptions = "\n".join(
-                    f"- {tool['name']}: {tool['description']}"
-                    for tool in formatted_tools
-                )
-                system_content = f"""You have access to the following tools:
+    def _with_tools(self,
+                    messages: List[Message],
+                    tools: Optional[List[Dict[str, Any]]]) -> Tuple[Optional[List[Dict[str, Any]]], List[Message]]:
+        """Format tools and prepend the system message describing them
+
+        Agents pass the same tools list on every call, so the formatted
+        tools and system message are built once per list and reused.
+
+        Returns:
+            The formatted tools (None without tools) and the messages to send
+        """
+        if not tools:
+            return None, messages
+
+        cached = self._tools_cache
+        if cached is None or cached[0] is not tools:
+            cached = self._tools_cache = (tools, *self._format_tools(tools))
+        _, formatted_tools, system_message = cached
+        return formatted_tools, [system_message] + messages
+
+    def _format_tools(self, tools: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Message]:
+        """Build the function schemas and the system message describing tools"""
+        # Format tools for OpenAI function calling format
+        formatted_tools = []
+        for tool in tools:
+            formatted_tool = {
+                "name": tool["name"],
+                "description": tool["description"],
+                "parameters": tool.get("parameters") or DEFAULT_TOOL_PARAMETERS
+            }
+            formatted_tools.append(formatted_tool)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Formatted tools: %s", orjson.dumps(formatted_tools, option=orjson.OPT_INDENT_2).decode())
+
+        tool_descriptions = "\n".join(
+            f"- {tool['name']}: {tool['description']}"
+            for tool in formatted_tools
+        )
+        system_content = f"""You have access to the following tools:
 {tool_descriptions}
 
 When you need to search for information or use a tool, choose the appropriate tool and provide a relevant query.
@@ -66,13 +82,24 @@ First analyze what tool would be most appropriate, then use it with a well-formu
 Always summarize the results in a clear and concise way.
 To use a tool, include it in your response like this: <tool_call>{{"name": "tool_name", "parameters": {{"query": "your query"}}}}</tool_call>"""
 
-                messages = [Message(
-                    role=MessageRole.SYSTEM,
-                    content=system_content
-                )] + messages
+        return formatted_tools, Message(
+            role=MessageRole.SYSTEM,
+            content=system_content
+        )
 
-            logger.info(f"Generating response with model: {self.model}")
-            logger.debug(f"Final messages: {messages}")
+    async def generate_response(self,
+                             messages: List[Message],
+                             tools: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Generate a response from the LLM with optional tool support"""
+        try:
+            logger.info("Starting response generation")
+            logger.debug("Input messages: %s", messages)
+            logger.debug("Available tools: %s", tools)
+
+            formatted_tools, messages = self._with_tools(messages, tools)
+
+            logger.info("Generating response with model: %s", self.model)
+            logger.debug("Final messages: %s", messages)
 
             response = await self.provider.generate(
                 messages=messages,
@@ -80,13 +107,37 @@ To use a tool, include it in your response like this: <tool_call>{{"name": "tool
             )
 
             logger.info("Response generated successfully")
-            logger.debug(f"Raw response: {json.dumps(response, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw response: %s", orjson.dumps(response, option=orjson.OPT_INDENT_2, default=str).decode())
 
             return response
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
-            logger.error(f"Error generating response: {str(e)}", exc_info=True)
+            logger.error("Error generating response: %s", e, exc_info=True)
             return {
                 "content": f"Error generating response: {str(e)}",
-                "tool_calls": []
-            }
\ No newline at end of file
+                "tool_calls": [],
+                "error": str(e)
+            }
+
+    async def generate_response_stream(self,
+                                       messages: List[Message],
+                                       tools: Optional[List[Dict[str, Any]]] = None) -> AsyncIterator[str]:
+        """Stream a response, describing tools in the system message
+
+        Tools are offered as text, so this suits models that write
+        <tool_call> blocks rather than using function calling.
+        """
+        _, messages = self._with_tools(messages, tools)
+        async for chunk in self.generate_stream(messages):
+            yield chunk
+
+    async def generate_stream(self, messages: List[Message]) -> AsyncIterator[str]:
+        """Stream a response from the LLM without tool support"""
+        logger.info("Streaming response with model: %s", self.model)
+        logger.debug("Input messages: %s", messages)
+
+        async for chunk in self.provider.generate_stream(messages):
+            yield chunk
@@ -1,12 +1,80 @@
 """Memory management using HawkinDB"""
 
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
+import asyncio
 import logging
-from .storage import HawkinDBStorage, StorageConfig
+from .runtime.coalesce import SingleFlight
+from .storage import BaseStorage, HawkinDBStorage, StorageConfig
 
 logger = logging.getLogger(__name__)
 
+# Number of recent memory searches remembered between writes
+RECALL_CACHE_SIZE = 128
+
+class InsertBatcher:
+    """Buffers memory writes and inserts them in batches
+
+    Writes arriving within a short window (or until max_rows are waiting)
+    go to storage together in one insert_many call, off the caller's path.
+    Rows still queued when the event loop stops are lost, so call flush
+    before exiting.
+    """
+
+    def __init__(self, storage: BaseStorage, wait: float = 0.2, max_rows: int = 100):
+        """Initialize the batcher
+
+        Args:
+            storage: Storage to write to
+            wait: Seconds to wait for more writes before inserting
+            max_rows: Maximum number of rows per insert_many call
+        """
+        self.storage = storage
+        self.wait = wait
+        self.max_rows = max_rows
+        self._pending: List[Dict[str, Any]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def add(self, data: Dict[str, Any]) -> None:
+        """Queue a row for the next batch
+
+        Args:
+            data: Row to insert
+        """
+        self._pending.append(data)
+        if len(self._pending) >= self.max_rows:
+            self._write_pending()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.wait, self._write_pending)
+
+    async def flush(self) -> None:
+        """Insert every queued row and wait for inserts in progress"""
+        self._write_pending()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    def _write_pending(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_rows):
+            task = asyncio.get_running_loop().create_task(
+                self._insert(pending[start:start + self.max_rows])
+            )
+            # Keep a reference so the task isn't garbage collected mid-run
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            await self.storage.insert_many(rows)
+        except Exception as e:
+            logger.error("Error inserting %d memories: %s", len(rows), e)
+
 class MemoryManager:
     """Manages agent memory using HawkinDB
 
@@ -20,7 +88,10 @@ class MemoryManager:
         """Initialize memory manager
 
         Args:
-            config: Optional configuration for memory management
+            config: Optional configuration for memory management. Besides the
+                retention settings, setting "insert_wait" (seconds) batches
+                writes instead of inserting each one as it is added, with at
+                most "insert_batch_size" (default 100) rows per batch.
         """
         config = config or {}
         storage_config = StorageConfig(
@@ -29,10 +100,31 @@ class MemoryManager:
             importance_threshold=config.get('importance_threshold', 0.0)
         )
         self.storage = HawkinDBStorage(config=storage_config)
+        self._inserts: Optional[InsertBatcher] = None
+        if config.get('insert_wait') is not None:
+            self._inserts = InsertBatcher(
+                self.storage,
+                wait=config['insert_wait'],
+                max_rows=config.get('insert_batch_size', 100)
+            )
+        # Search results by (query, limit); any write clears it, so it never
+        # returns results that miss a newer memory
+        self._recall_cache: "OrderedDict[Tuple[str, int], List[Dict[str, Any]]]" = OrderedDict()
+        # Searches still running, by (query, limit, write count)
+        self._recalls = SingleFlight()
+        self._writes = 0
+
+    def _forget_recalls(self) -> None:
+        """Drop cached searches before memory changes"""
+        self._recall_cache.clear()
+        self._writes += 1
 
     async def add_interaction(self, user_message: str, agent_response: str):
         """Add an interaction to memory
 
+        With batched writes the interaction is queued for the next batch;
+        searches wait for queued writes, so they always see it.
+
         Args:
             user_message: The user's message
             agent_response: The agent's response
@@ -52,7 +144,8 @@ class MemoryManager:
                 }
             }
 
-            await self.storage.insert(memory_data)
+            self._forget_recalls()
+            await self._write(memory_data)
             logger.info(f"Added interaction to memory: {user_message[:50]}...")
 
         except Exception as e:
@@ -75,11 +168,12 @@ class MemoryManager:
             List of relevant memory entries
         """
         try:
-            memories = await self.storage.search(
-                query=query,
-                collection="memories",
-                limit=limit
-            )
+            key = (query, limit)
+            memories = self._recall_cache.get(key)
+            if memories is None:
+                memories = await self._search(key)
+            else:
+                self._recall_cache.move_to_end(key)
 
             # Filter by time window if specified
             if time_window and memories:
@@ -95,6 +189,39 @@ class MemoryManager:
             logger.error(f"Error retrieving memories: {str(e)}")
             return []
 
+    async def _search(self, key: Tuple[str, int]) -> List[Dict[str, Any]]:
+        """Search storage, joining an identical search that is still running
+
+        A running search is only joined if nothing was written since it
+        started, so the result never misses a newer memory. A caller being
+        cancelled doesn't affect the others.
+        """
+        writes = self._writes
+        memories = await self._recalls.run((*key, writes), lambda: self._search_storage(key))
+
+        # Don't cache a result that raced with a write
+        if writes == self._writes:
+            self._recall_cache[key] = memories
+            if len(self._recall_cache) > RECALL_CACHE_SIZE:
+                self._recall_cache.popitem(last=False)
+        return memories
+
+    async def _write(self, data: Dict[str, Any]) -> None:
+        """Insert a row now, or queue it when writes are batched"""
+        if self._inserts is None:
+            await self.storage.insert(data)
+        else:
+            self._inserts.add(data)
+
+    async def _search_storage(self, key: Tuple[str, int]) -> List[Dict[str, Any]]:
+        await self.flush()
+        query, limit = key
+        return await self.storage.search(
+            query=query,
+            collection="memories",
+            limit=limit
+        )
+
     def _calculate_importance(self, message: str) -> float:
         """Calculate the importance score of a message
 
@@ -127,17 +254,29 @@ class MemoryManager:
                 }
             }
 
-            await self.storage.insert(knowledge_data)
+            self._forget_recalls()
+            await self._write(knowledge_data)
 
         except Exception as e:
             logger.error(f"Error adding knowledge to memory: {str(e)}")
 
+    async def flush(self):
+        """Write every queued memory to storage
+
+        Only needed with batched writes; call it before shutting down so the
+        last interactions aren't lost.
+        """
+        if self._inserts is not None:
+            await self._inserts.flush()
+
     async def clear(self):
         """Clear all memories
 
         This should be used with caution as it removes all stored memories.
         """
         try:
+            self._forget_recalls()
+            await self.flush()
             await self.storage.clear()
             logger.info("Cleared all memories")
 
@@ -1,6 +1,7 @@
 """Mock implementations of external dependencies for development"""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+import hashlib
 
 class LiteLLM:
     def __init__(self, model: str):
@@ -79,18 +80,50 @@ class Document:
         self.content = content
 
 class KnowledgeBase:
-    """Mock knowledge base for development"""
+    """Mock knowledge base for development
+
+    Documents are indexed once when added: identical content (by
+    blake2b-128 hash) is only stored once, and the lowercased text used
+    for matching is computed at insert time rather than on every query.
+    """
     def __init__(self):
         """Initialize the knowledge base"""
-        self.documents = []
+        self._documents = []
+        self._index = []  # Lowercased content, parallel to _documents
+        self._hashes = set()
+
+    @property
+    def documents(self) -> Tuple[Document, ...]:
+        """Stored documents; add new ones with add_document(s)"""
+        return tuple(self._documents)
+
+    def _index_document(self, document: Document):
+        """Index a document unless identical content is already present"""
+        digest = hashlib.blake2b(document.content.encode(), digest_size=16).digest()
+        if digest in self._hashes:
+            return
+        self._hashes.add(digest)
+        self._documents.append(document)
+        self._index.append(document.content.lower())
 
     async def add_document(self, document: Document):
         """Add a document to the knowledge base
 
         Args:
-            document: Document object to add
+            document: Document object to add; ignored if a document with
+                identical content is already stored
+        """
+        self._index_document(document)
+
+    async def add_documents(self, documents: List[Document]):
+        """Add several documents to the knowledge base in one call
+
+        Args:
+            documents: Document objects to add; any whose content is
+                already stored are ignored
         """
-        self.documents.append(document)
+        for document in documents:
+            self._index_document(document)
 
     async def query(self, query: str) -> list[str]:
         """Query the knowledge base
@@ -105,8 +138,7 @@ class KnowledgeBase:
         results = []
         query_terms = query.lower().split()
 
-        for doc in self.documents:
-            content = doc.content.lower()
+        for doc, content in zip(self._documents, self._index):
             if any(term in content for term in query_terms):
                 results.append(doc.content)
 
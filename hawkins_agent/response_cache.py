@@ -0,0 +1,213 @@
+"""Semantic cache of agent responses
+
+Messages are embedded with a sentence-transformers model and compared by
+cosine similarity, so a paraphrase of an earlier message (not just an exact
+repeat) is answered from the cache instead of calling the LLM again.
+
+Requires the ``semantic-cache`` extra (numpy and sentence-transformers).
+
+Example:
+    >>> cache = SemanticCache(threshold=0.87)
+    >>> agent = AgentBuilder("assistant").with_response_cache(cache).build()
+"""
+
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable, List, Optional, Set, Tuple
+import asyncio
+import importlib.util
+import logging
+from .types import AgentResponse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+class BatchEmbedder:
+    """Micro-batches concurrent embedding requests into one encode call
+
+    Requests arriving within a short window (or until max_batch are
+    waiting) are embedded together, so the model's per-call overhead is paid
+    once per batch instead of once per message.
+    """
+
+    def __init__(self,
+                 encode: Callable[[List[str]], "np.ndarray"],
+                 window: float = 0.01,
+                 max_batch: int = 32):
+        """Initialize the batcher
+
+        Args:
+            encode: Blocking function embedding a list of texts into an
+                array with one row per text; run in a worker thread
+            window: Seconds to wait for more requests before encoding
+            max_batch: Maximum number of texts per encode call
+        """
+        self.encode = encode
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> "np.ndarray":
+        """Embed one text as part of the next batch
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            The text's embedding
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch):
+            task = asyncio.get_running_loop().create_task(
+                self._encode_batch(pending[start:start + self.max_batch])
+            )
+            # Keep a reference so the task isn't garbage collected mid-run
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _encode_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            # Model inference is CPU bound, keep it off the event loop
+            embeddings = await asyncio.to_thread(self.encode, [text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            # Callers that gave up have cancelled their future
+            if not future.done():
+                future.set_result(embedding)
+
+class SemanticCache:
+    """LRU cache of agent responses looked up by message similarity"""
+
+    def __init__(self,
+                 threshold: float = 0.87,
+                 max_size: int = 2000,
+                 model_name: str = "all-MiniLM-L6-v2"):
+        """Initialize the cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cached response to be
+                reused
+            max_size: Maximum number of responses to keep
+            model_name: sentence-transformers model used to embed messages
+        """
+        # sentence-transformers is only imported once the first message is
+        # embedded, so check here that it is installed
+        if np is None or importlib.util.find_spec("sentence_transformers") is None:
+            raise ImportError(
+                "SemanticCache requires numpy and sentence-transformers; "
+                "install hawkins-agent[semantic-cache]"
+            )
+        self.threshold = threshold
+        self.max_size = max_size
+        self.model_name = model_name
+        self._model = None
+        self._embedder = BatchEmbedder(self._encode)
+        # Row i of _embeddings belongs to _responses[i]
+        self._embeddings: Optional["np.ndarray"] = None
+        self._responses: List[Optional[AgentResponse]] = [None] * max_size
+        # Used slots, least recently used first
+        self._order: "OrderedDict[int, None]" = OrderedDict()
+
+    def _encode(self, messages: List[str]) -> "np.ndarray":
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(
+            messages,
+            batch_size=len(messages),
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype(np.float32)
+
+    async def embed(self, message: str) -> "np.ndarray":
+        """Embed a message for lookup
+
+        Concurrent calls are batched into a single model call.
+
+        Args:
+            message: User message
+
+        Returns:
+            Normalized float32 embedding
+        """
+        return await self._embedder.embed(message)
+
+    def get(self, embedding: "np.ndarray") -> Optional[AgentResponse]:
+        """Get the cached response for the most similar earlier message
+
+        Args:
+            embedding: Embedding of the new message (see embed)
+
+        Returns:
+            A copy of the cached response with "cache_hit" and "similarity"
+            in its metadata, or None if no message is similar enough
+        """
+        if not self._order:
+            return None
+
+        # Slots are filled in order and only reused once full, so the first
+        # len(_order) rows are exactly the cached embeddings. They are
+        # normalized, so the dot product is the cosine similarity
+        similarities = self._embeddings[:len(self._order)] @ embedding
+        slot = int(similarities.argmax())
+        similarity = float(similarities[slot])
+        if similarity < self.threshold:
+            return None
+
+        self._order.move_to_end(slot)
+        response = self._responses[slot]
+        logger.info(f"Semantic cache hit (similarity {similarity:.3f})")
+        return replace(
+            response,
+            metadata={**response.metadata, "cache_hit": True, "similarity": similarity}
+        )
+
+    def put(self, embedding: "np.ndarray", response: AgentResponse) -> None:
+        """Cache a response
+
+        Args:
+            embedding: Embedding of the message that produced the response
+            response: Response to cache
+        """
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.max_size, embedding.shape[0]), dtype=np.float32)
+
+        if len(self._order) < self.max_size:
+            slot = len(self._order)
+        else:
+            # Reuse the least recently used slot
+            slot, _ = self._order.popitem(last=False)
+
+        self._embeddings[slot] = embedding
+        self._responses[slot] = response
+        self._order[slot] = None
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        self._order.clear()
+        self._responses = [None] * self.max_size
@@ -0,0 +1,29 @@
+"""
+Hawkins Agent Runtime
+Helpers for running agents safely under concurrency
+"""
+
+from .admission import bounded_process, bounded_stream
+from .breaker import CircuitBreaker, CircuitOpenError, CircuitState, get_breaker
+from .coalesce import SingleFlight
+from .http import close_http_client, create_http_client, get_http_client
+from .limiter import RateLimiter, estimate_tokens
+from .loop import run
+from .priority import PriorityGate
+
+__all__ = [
+    "bounded_process",
+    "bounded_stream",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CircuitState",
+    "get_breaker",
+    "close_http_client",
+    "create_http_client",
+    "get_http_client",
+    "PriorityGate",
+    "SingleFlight",
+    "RateLimiter",
+    "estimate_tokens",
+    "run"
+]
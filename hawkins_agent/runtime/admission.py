@@ -0,0 +1,114 @@
+"""Admission control for agent requests
+
+bounded_process caps how many agent.process calls run at once across a
+whole program (HAWKINS_MAX_CONCURRENCY, default 5) and bounds how long
+each may take (HAWKINS_PROCESS_TIMEOUT seconds, default 120). When calls
+are queued, more urgent ones (lower priority values, then shorter prompts)
+are admitted first. The limit can be changed at runtime with
+set_limit("process", n).
+"""
+
+from typing import Dict, Any, Optional, AsyncIterator, TYPE_CHECKING
+import asyncio
+import logging
+import os
+import weakref
+from ..limits import LIMITS
+from ..types import AgentResponse
+from .limiter import estimate_tokens
+from .priority import PriorityGate
+
+if TYPE_CHECKING:
+    from ..agent import Agent
+
+logger = logging.getLogger(__name__)
+
+# Limit name shared by every bounded_process call
+ADMISSION = "process"
+LIMITS.setdefault(ADMISSION, int(os.getenv("HAWKINS_MAX_CONCURRENCY", "5")))
+
+DEFAULT_TIMEOUT = float(os.getenv("HAWKINS_PROCESS_TIMEOUT", "120"))
+DEFAULT_PRIORITY = 10
+
+# Gates belong to the event loop they are used on
+_gates: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, PriorityGate]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _get_gate() -> PriorityGate:
+    loop = asyncio.get_running_loop()
+    gate = _gates.get(loop)
+    if gate is None or gate.limit != LIMITS[ADMISSION]:
+        # Like set_limit's semaphores, a new limit applies to calls admitted
+        # from now on; calls already holding or waiting on the old gate keep it
+        gate = _gates[loop] = PriorityGate(LIMITS[ADMISSION])
+    return gate
+
+async def bounded_process(
+    agent: "Agent",
+    message: str,
+    context: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    priority: int = DEFAULT_PRIORITY,
+    stateless: bool = False
+) -> AgentResponse:
+    """Process a message once a concurrency slot is free, with a timeout
+
+    Args:
+        agent: Agent to process the message
+        message: User message to process
+        context: Optional additional context
+        timeout: Maximum seconds for the call, or None for no limit
+        priority: Admission priority when calls are queued; lower values
+            go first (e.g. a coordinator that blocks the final result)
+        stateless: Use agent.stateless_process, so the call neither reads
+            nor updates the agent's memory
+
+    Returns:
+        The agent's response, or an error response if the call timed out
+    """
+    gate = _get_gate()
+    await gate.acquire(priority, estimate_tokens([{"content": message}]))
+    process = agent.stateless_process if stateless else agent.process
+    try:
+        return await asyncio.wait_for(
+            process(message, context=context),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        logger.error(f"Agent {agent.name} timed out after {timeout}s")
+        return AgentResponse(
+            message=f"I could not finish processing your message within {timeout} seconds",
+            tool_calls=[],
+            metadata={"error": f"Timed out after {timeout}s"}
+        )
+    finally:
+        gate.release()
+
+async def bounded_stream(
+    agent: "Agent",
+    message: str,
+    context: Optional[Dict[str, Any]] = None,
+    priority: int = DEFAULT_PRIORITY
+) -> AsyncIterator[str]:
+    """Stream a response once a concurrency slot is free
+
+    The slot is held until the stream is exhausted or closed. Request time
+    is bounded by the provider's own timeout setting.
+
+    Args:
+        agent: Agent to process the message
+        message: User message to process
+        context: Optional additional context
+        priority: Admission priority when calls are queued
+
+    Yields:
+        Chunks of the response text
+    """
+    gate = _get_gate()
+    await gate.acquire(priority, estimate_tokens([{"content": message}]))
+    try:
+        async for chunk in agent.process_stream(message, context=context):
+            yield chunk
+    finally:
+        gate.release()
@@ -0,0 +1,126 @@
+"""Circuit breakers for LLM provider calls
+
+Each provider gets a breaker that watches the outcome of its recent calls.
+When at least half of the calls in the last 30 seconds failed (with at least
+five calls seen), the circuit opens and further calls fail immediately with
+CircuitOpenError instead of each waiting out its own timeouts and retries.
+After 10 seconds a single probe call is let through; success closes the
+circuit again and failure reopens it.
+"""
+
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(Enum):
+    """States of a circuit breaker"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its provider's circuit is open"""
+
+class CircuitBreaker:
+    """Three-state circuit breaker over a rolling window of call outcomes"""
+
+    def __init__(self,
+                 name: str,
+                 window: float = 30.0,
+                 min_calls: int = 5,
+                 failure_ratio: float = 0.5,
+                 reset_timeout: float = 10.0):
+        """Initialize the breaker
+
+        Args:
+            name: Provider name, used in errors and logs
+            window: Seconds of call history to consider
+            min_calls: Minimum calls in the window before the circuit can open
+            failure_ratio: Fraction of failed calls that opens the circuit
+            reset_timeout: Seconds to stay open before letting a probe through
+        """
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        """Check that a call may proceed
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight
+        """
+        if self.state is CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Circuit for {self.name} is open")
+            self.state = CircuitState.HALF_OPEN
+            self._probing = False
+
+        if self.state is CircuitState.HALF_OPEN:
+            if self._probing:
+                raise CircuitOpenError(f"Circuit for {self.name} is open")
+            self._probing = True
+
+    def record_success(self) -> None:
+        """Record a successful call"""
+        if self.state is CircuitState.HALF_OPEN:
+            logger.info(f"Circuit for {self.name} closed")
+            self.state = CircuitState.CLOSED
+            self._probing = False
+            self._calls.clear()
+            return
+        self._record(True)
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if failures dominate"""
+        if self.state is CircuitState.HALF_OPEN:
+            self._open()
+            return
+
+        self._record(False)
+        failures = sum(1 for _, ok in self._calls if not ok)
+        if (len(self._calls) >= self.min_calls and
+                failures / len(self._calls) >= self.failure_ratio):
+            self._open()
+
+    def release(self) -> None:
+        """Forget a call that ended without an outcome (e.g. cancelled)"""
+        if self.state is CircuitState.HALF_OPEN:
+            self._probing = False
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._calls.append((now, ok))
+        while self._calls and self._calls[0][0] < now - self.window:
+            self._calls.popleft()
+
+    def _open(self) -> None:
+        logger.warning(f"Circuit for {self.name} opened after repeated failures")
+        self.state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get the circuit breaker for a provider
+
+    Args:
+        name: Provider name
+
+    Returns:
+        The breaker shared by every call to that provider
+    """
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+    return _breakers[name]
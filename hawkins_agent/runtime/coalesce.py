@@ -0,0 +1,73 @@
+"""Coalescing of identical concurrent calls
+
+SingleFlight runs at most one call per key at a time; callers arriving
+while it runs await the same result instead of starting their own.
+
+Example:
+    >>> flight = SingleFlight()
+    >>> result = await flight.run(key, lambda: fetch(query))
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, TypeVar
+import asyncio
+import weakref
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """Shares one in-flight call between concurrent callers with the same key
+
+    The call runs in its own task and every caller awaits it through
+    asyncio.shield, so a cancelled caller (e.g. one timed out by
+    bounded_process) only stops waiting itself. The call is cancelled
+    once no caller is left waiting for it.
+    """
+
+    def __init__(self):
+        # In-flight calls per event loop: key -> [task, waiting callers]
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, List[Any]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Run call, or join the identical call already running
+
+        Args:
+            key: Identifies identical calls
+            call: Starts the call; only invoked if none is running for key
+
+        Returns:
+            The call's result
+
+        Raises:
+            Whatever the call raised, for every caller sharing it
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        entry = calls.get(key)
+        if entry is None:
+            entry = [loop.create_task(call()), 0]
+            calls[key] = entry
+            entry[0].add_done_callback(lambda task: self._finish(calls, key, entry))
+
+        entry[1] += 1
+        try:
+            return await asyncio.shield(entry[0])
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[0].done():
+                # Nobody is waiting any more; later callers start afresh
+                self._forget(calls, key, entry)
+                entry[0].cancel()
+
+    def _finish(self, calls: Dict[Hashable, List[Any]], key: Hashable, entry: List[Any]) -> None:
+        self._forget(calls, key, entry)
+        task = entry[0]
+        if not task.cancelled():
+            # Retrieve the exception so a call without waiters doesn't warn
+            task.exception()
+
+    @staticmethod
+    def _forget(calls: Dict[Hashable, List[Any]], key: Hashable, entry: List[Any]) -> None:
+        if calls.get(key) is entry:
+            del calls[key]
@@ -0,0 +1,68 @@
+"""Shared HTTP client for LLM providers and tools
+
+Reusing one keep-alive client means each host's DNS lookup and TLS
+handshake happen once per process instead of once per request.
+
+Example:
+    >>> client = create_http_client()
+    >>> weather = WeatherTool(client=client)
+    >>> provider = LiteLLMProvider("openai/gpt-4o", http_client=client)
+    >>> ...
+    >>> await client.aclose()
+"""
+
+from typing import Optional
+import asyncio
+import weakref
+import httpx
+
+def create_http_client(max_connections: int = 100,
+                       max_keepalive_connections: int = 20,
+                       timeout: float = 120.0,
+                       http2: bool = True) -> httpx.AsyncClient:
+    """Create a keep-alive HTTP client to share between providers and tools
+
+    With HTTP/2 enabled, concurrent requests to the same host are
+    multiplexed over a single connection. Responses are requested with
+    gzip compression by httpx's default Accept-Encoding header.
+
+    Args:
+        max_connections: Maximum number of open connections
+        max_keepalive_connections: Maximum number of idle connections kept open
+        timeout: Request timeout in seconds
+        http2: Whether to negotiate HTTP/2 with servers that support it
+
+    Returns:
+        An httpx.AsyncClient; the caller is responsible for closing it
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        ),
+        timeout=httpx.Timeout(timeout),
+        http2=http2
+    )
+
+# Pooled connections belong to the event loop they were opened on
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the running event loop's shared HTTP client, creating it on first use
+
+    Returns:
+        The shared httpx.AsyncClient; close it with close_http_client
+    """
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _shared_clients[loop] = create_http_client()
+    return client
+
+async def close_http_client() -> None:
+    """Close the running event loop's shared HTTP client if it was created"""
+    client = _shared_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,96 @@
+"""Proactive request and token rate limiting for LLM providers
+
+RateLimiter keeps two token buckets, one for requests per minute and one
+for tokens per minute, and waits before a call would exceed either rather
+than relying on retries after a 429. The allowed rates adapt with AIMD:
+they are halved whenever the provider still rate-limits a call and grow
+back gradually after a run of successful calls.
+"""
+
+from typing import Dict, List
+import asyncio
+import time
+
+def estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """Roughly estimate the prompt tokens in a list of chat messages
+
+    Args:
+        messages: Messages in LiteLLM format
+
+    Returns:
+        Estimated token count (about four characters per token)
+    """
+    return sum(len(message.get("content") or "") for message in messages) // 4
+
+class RateLimiter:
+    """Token-bucket limiter for requests and tokens per minute
+
+    Example:
+        >>> limiter = RateLimiter(rpm=500, tpm=30000)
+        >>> provider = LiteLLMProvider("openai/gpt-4o", rate_limiter=limiter)
+    """
+
+    def __init__(self, rpm: int, tpm: int, increase_after: int = 10):
+        """Initialize the limiter
+
+        Args:
+            rpm: Maximum requests per minute
+            tpm: Maximum tokens per minute
+            increase_after: Consecutive successes before the rates grow again
+        """
+        self.max_rpm = float(rpm)
+        self.max_tpm = float(tpm)
+        self.rpm = self.max_rpm
+        self.tpm = self.max_tpm
+        self.increase_after = increase_after
+        self._requests = self.rpm
+        self._tokens = self.tpm
+        self._updated = time.monotonic()
+        self._successes = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the capacity accrued since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until a request using the given number of tokens may be sent
+
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        # Waiters are served in order while holding the lock
+        async with self._lock:
+            while True:
+                self._refill()
+                needed = min(tokens, self.tpm)
+                if self._requests >= 1 and self._tokens >= needed:
+                    self._requests -= 1
+                    self._tokens -= needed
+                    return
+
+                await asyncio.sleep(max(
+                    (1 - self._requests) * 60 / self.rpm,
+                    (needed - self._tokens) * 60 / self.tpm,
+                    0.01
+                ))
+
+    def record_success(self) -> None:
+        """Additively increase the rates after enough successful calls"""
+        self._successes += 1
+        if self._successes >= self.increase_after:
+            self._successes = 0
+            self.rpm = min(self.max_rpm, self.rpm + 1)
+            self.tpm = min(self.max_tpm, self.tpm + self.max_tpm / self.max_rpm)
+
+    def record_rate_limited(self) -> None:
+        """Halve the rates after the provider rejected a call"""
+        self._successes = 0
+        self.rpm = max(1.0, self.rpm / 2)
+        self.tpm = max(self.max_tpm / self.max_rpm, self.tpm / 2)
+        self._requests = min(self._requests, self.rpm)
+        self._tokens = min(self._tokens, self.tpm)
@@ -0,0 +1,30 @@
+"""Event loop selection for running agents
+
+uvloop, a libuv-based event loop, cuts per-callback and socket overhead for
+I/O-bound workloads such as many concurrent LLM and tool requests. It is
+installed with the speedups extra and is not available on Windows.
+
+Example:
+    >>> from hawkins_agent.runtime import run
+    >>> run(main())
+"""
+
+from typing import Any, Coroutine, TypeVar
+import asyncio
+
+T = TypeVar("T")
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on uvloop if installed, else asyncio
+
+    Args:
+        main: Coroutine to run, usually the program's main()
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
@@ -0,0 +1,66 @@
+"""Priority-ordered admission gate
+
+PriorityGate works like a semaphore, but when callers are waiting for a
+slot the one with the lowest (priority, weight) goes next. Lower priority
+numbers are more urgent; weight (such as estimated prompt tokens) breaks
+ties so shorter jobs go first. Callers with equal keys are served in
+arrival order.
+"""
+
+from typing import List, Tuple
+import asyncio
+import heapq
+import itertools
+
+class PriorityGate:
+    """Concurrency limit that admits waiting callers by priority
+
+    Example:
+        >>> gate = PriorityGate(limit=4)
+        >>> await gate.acquire(priority=1)
+        >>> try:
+        ...     await do_work()
+        ... finally:
+        ...     gate.release()
+    """
+
+    def __init__(self, limit: int):
+        """Initialize the gate
+
+        Args:
+            limit: Maximum number of holders at once
+        """
+        self.limit = limit
+        self._active = 0
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    async def acquire(self, priority: int = 0, weight: int = 0) -> None:
+        """Wait for a slot
+
+        Args:
+            priority: Lower values are admitted first
+            weight: Tie-breaker within a priority; lower values go first
+        """
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, weight, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A slot handed over just before cancellation must be passed on
+            if not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Release a slot, handing it to the most urgent waiter if any"""
+        while self._waiters:
+            _, _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
@@ -45,6 +45,20 @@ class BaseStorage(ABC):
         """
         pass
         
+    async def insert_many(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Insert several entries into storage
+
+        Storage engines with a bulk insert should override this; the
+        default inserts the entries one by one.
+
+        Args:
+            items: Data to store
+
+        Returns:
+            IDs of the stored data, in order
+        """
+        return [await self.insert(item) for item in items]
+
     @abstractmethod
     async def search(self,
                     query: str,
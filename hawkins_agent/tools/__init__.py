@@ -4,8 +4,9 @@ A collection of tools for use with Hawkins agents
 """
 
 from .base import BaseTool
+from .cache import ToolRunCache, tool_cache
 from .email import EmailTool
-from .search import WebSearchTool
+from .search import WebSearchTool, WebSearchBatchTool
 from .rag import RAGTool
 from .summarize import SummarizationTool
 from .code_interpreter import CodeInterpreterTool
@@ -13,8 +14,11 @@ from .weather import WeatherTool
 
 __all__ = [
     "BaseTool",
+    "ToolRunCache",
+    "tool_cache",
     "EmailTool", 
     "WebSearchTool",
+    "WebSearchBatchTool",
     "RAGTool",
     "SummarizationTool",
     "CodeInterpreterTool",
@@ -28,8 +28,16 @@ class BaseTool(ABC):
 
     Attributes:
         _name: Protected name attribute of the tool
+        cache_ttl: Seconds to cache successful results for identical
+            parameters, or None to always execute
+        needs_summary: Whether the agent should ask the LLM to summarize
+            successful results; tools whose result is already a readable
+            answer set this to False to skip that extra LLM call
     """
 
+    cache_ttl: Optional[float] = None
+    needs_summary: bool = True
+
     def __init__(self, name: Optional[str] = None):
         """Initialize the tool with an optional custom name
 
@@ -58,6 +66,27 @@ class BaseTool(ABC):
         """
         pass
 
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        """JSON schema of the tool's parameters, sent to the LLM
+
+        Override this if the tool takes parameters other than a single
+        "query" string.
+
+        Returns:
+            A JSON schema object describing the keyword arguments of execute
+        """
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The query to be processed by the tool"
+                }
+            },
+            "required": ["query"]
+        }
+
     @abstractmethod
     async def execute(self, **kwargs) -> ToolResponse:
         """Execute the tool with the provided parameters
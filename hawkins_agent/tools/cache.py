@@ -0,0 +1,94 @@
+"""Result cache for tool executions
+
+Tools that set ``cache_ttl`` have their successful results cached by the
+agent, keyed by tool name and call parameters, so repeated identical calls
+(the same city's weather, the same search) skip the external request
+until the entry expires.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import time
+import orjson
+from ..types import ToolResponse
+
+class ToolRunCache:
+    """In-memory LRU cache of tool results with per-entry expiry"""
+
+    def __init__(self, max_size: int = 1024):
+        """Initialize the cache
+
+        Args:
+            max_size: Maximum number of results to keep
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, bytes], Tuple[float, ToolResponse]]" = OrderedDict()
+
+    @staticmethod
+    def _key(name: str, params: Dict[str, Any]) -> Tuple[str, bytes]:
+        """Build a cache key from a tool name and its canonicalized parameters"""
+        return name, orjson.dumps(
+            params,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str
+        )
+
+    def get(self, name: str, params: Dict[str, Any]) -> Optional[ToolResponse]:
+        """Get a cached result
+
+        Args:
+            name: Tool name
+            params: Parameters the tool was called with
+
+        Returns:
+            The cached ToolResponse, or None if missing or expired
+        """
+        key = self._key(name, params)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, name: str, params: Dict[str, Any], value: ToolResponse, ttl: float) -> None:
+        """Cache a result
+
+        Args:
+            name: Tool name
+            params: Parameters the tool was called with
+            value: Result to cache
+            ttl: Seconds until the entry expires
+        """
+        key = self._key(name, params)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, name: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Drop cached results of one tool
+
+        Args:
+            name: Tool name
+            params: Only drop the result for these parameters; every result
+                of the tool if omitted
+        """
+        if params is not None:
+            self._entries.pop(self._key(name, params), None)
+            return
+
+        for key in [key for key in self._entries if key[0] == name]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove every cached result"""
+        self._entries.clear()
+
+# Shared by every agent in the process
+tool_cache = ToolRunCache()
@@ -75,7 +75,7 @@ class CodeInterpreterTool(BaseTool):
                     result=None
                 )
 
-            logger.info(f"Executing code interpreter for query: {query}")
+            logger.info("Executing code interpreter for query: %s", query)
             
             # Run the interpreter
             messages = self.interpreter.chat(query, display=False)
@@ -1,15 +1,18 @@
 """Email tool implementation"""
 
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 from typing import Dict, Any
 import logging
+import re
 from .base import BaseTool
 from ..types import ToolResponse
 
 logger = logging.getLogger(__name__)
 
+# One "@", no whitespace, and a dot in the domain
+EMAIL_PATTERN = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
 class EmailTool(BaseTool):
     """Tool for sending emails
 
@@ -17,11 +20,27 @@ class EmailTool(BaseTool):
     email addresses and handles common email sending errors gracefully.
     """
 
+    # "Email sent to ..." needs no further explanation
+    needs_summary = False
+
     @property
     def description(self) -> str:
         """Get the tool description"""
         return "Send emails with specified subject and content"
 
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        """JSON schema of the email fields"""
+        return {
+            "type": "object",
+            "properties": {
+                "to": {"type": "string", "description": "Recipient address"},
+                "subject": {"type": "string", "description": "Subject line"},
+                "content": {"type": "string", "description": "Plain text body"}
+            },
+            "required": ["to", "subject", "content"]
+        }
+
     def validate_params(self, params: Dict[str, Any]) -> bool:
         """Validate email parameters
 
@@ -35,13 +54,13 @@ class EmailTool(BaseTool):
         """
         required_fields = {'to', 'subject', 'content'}
         if not all(field in params for field in required_fields):
-            logger.error(f"Missing required email fields: {required_fields - set(params.keys())}")
+            logger.error("Missing required email fields: %s", required_fields - set(params.keys()))
             return False
 
         # Basic email validation
         email = params['to']
-        if '@' not in email or '.' not in email:
-            logger.error(f"Invalid email format: {email}")
+        if not isinstance(email, str) or not EMAIL_PATTERN.fullmatch(email):
+            logger.error("Invalid email format: %s", email)
             return False
 
         return True
@@ -69,14 +88,15 @@ class EmailTool(BaseTool):
                     error="Invalid email parameters"
                 )
 
-            msg = MIMEMultipart()
+            # A single text part needs no multipart container
+            msg = EmailMessage()
             msg['To'] = to
             msg['Subject'] = subject
-            msg.attach(MIMEText(content, 'plain'))
+            msg.set_content(content)
 
             # Implementation of email sending logic
             # For now, we're using the mock implementation
-            logger.info(f"Sending email to {to}")
+            logger.info("Sending email to %s", to)
 
             return ToolResponse(
                 success=True,
@@ -84,7 +104,7 @@ class EmailTool(BaseTool):
             )
 
         except Exception as e:
-            logger.error(f"Error sending email: {str(e)}")
+            logger.error("Error sending email: %s", e)
             return ToolResponse(
                 success=False,
                 result=None,
@@ -1,16 +1,35 @@
 """RAG tool implementation using HawkinsRAG"""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from hawkins_rag import HawkinsRAG
 from .base import BaseTool
+from .cache import tool_cache
 from ..types import ToolResponse
 
 class RAGTool(BaseTool):
     """Tool for retrieving information from knowledge base"""
 
-    def __init__(self, knowledge_base: HawkinsRAG):
-        super().__init__(name="RAGTool")
+    def __init__(self,
+                 knowledge_base: HawkinsRAG,
+                 cache_ttl: Optional[float] = None,
+                 name: str = "RAGTool"):
+        """Initialize the RAG tool
+
+        Args:
+            knowledge_base: Knowledge base to query
+            cache_ttl: Seconds to reuse results for a repeated query, or
+                None to always query. Call invalidate after adding
+                documents.
+            name: Tool name; cached results are shared by name, so give
+                tools over different knowledge bases different names
+        """
+        super().__init__(name=name)
         self.kb = knowledge_base
+        self.cache_ttl = cache_ttl
+
+    def invalidate(self) -> None:
+        """Drop cached results, e.g. after the knowledge base changed"""
+        tool_cache.invalidate(self.name)
 
     @property
     def description(self) -> str:
@@ -1,10 +1,12 @@
 """Web search tool implementation using Tavily API"""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import asyncio
 import logging
-import json
+import re
 from tavily import TavilyClient
 from .base import BaseTool
+from ..limits import get_semaphore
 from ..types import ToolResponse
 
 logger = logging.getLogger(__name__)
@@ -12,6 +14,9 @@ logger = logging.getLogger(__name__)
 class WebSearchTool(BaseTool):
     """Tool for web searching using Tavily AI"""
 
+    # Search results stay relevant for a day
+    cache_ttl = 24 * 60 * 60
+
     def __init__(self, api_key: str):
         """Initialize the search tool
 
@@ -55,30 +60,24 @@ class WebSearchTool(BaseTool):
         Returns:
             ToolResponse containing search results or error
         """
-        try:
-            # Extract and validate query
-            query = kwargs.get("query")
-            if not self.validate_params({"query": query}):
-                return ToolResponse(
-                    success=False, 
-                    error="Invalid or missing query parameter",
-                    result=None
-                )
+        # Extract and validate query
+        query = kwargs.get("query")
+        if not self.validate_params({"query": query}):
+            return ToolResponse(
+                success=False, 
+                error="Invalid or missing query parameter",
+                result=None
+            )
 
-            logger.info(f"Executing Tavily search for query: {query}")
+        return await self._search(query)
 
-            # Execute search with Tavily
-            search_params = {
-                "query": query,
-                "search_depth": "advanced",
-                "include_raw_content": False,
-                "include_domains": [],
-                "exclude_domains": [],
-                "max_results": 3
-            }
+    async def _search(self, query: str) -> ToolResponse:
+        """Run a single Tavily search and summarize the top results"""
+        try:
+            logger.info("Executing Tavily search for query: %s", query)
 
-            # Use synchronous search since Tavily client doesn't support async
-            response = self.client.search(query=query)
+            # Tavily's client is synchronous, keep it off the event loop
+            response = await asyncio.to_thread(self.client.search, query=query)
 
             if not response or "results" not in response:
                 logger.error("Invalid response from Tavily API")
@@ -88,21 +87,13 @@ class WebSearchTool(BaseTool):
                     result=None
                 )
 
-            # Format the results
-            results = []
-            for result in response.get("results", [])[:3]:  # Limit to top 3 results
-                results.append({
-                    "title": result.get("title", ""),
-                    "content": result.get("content", ""),
-                    "url": result.get("url", ""),
-                    "score": result.get("relevance_score", 0)
-                })
-
-            # Create a concise summary
-            summary = f"Found {len(results)} relevant results:\n\n"
-            for result in results:
-                summary += f"- {result['content'][:250]}...\n"
-                summary += f"  Source: {result['url']}\n\n"
+            # Create a concise summary of the top 3 results
+            results = response["results"][:3]
+            summary = f"Found {len(results)} relevant results:\n\n" + "".join(
+                f"- {result.get('content', '')[:250]}...\n"
+                f"  Source: {result.get('url', '')}\n\n"
+                for result in results
+            )
 
             return ToolResponse(
                 success=True,
@@ -117,4 +108,124 @@ class WebSearchTool(BaseTool):
                 success=False,
                 result=None,
                 error=error_msg
-            )
\ No newline at end of file
+            )
+
+    async def batch_search(self, queries: List[str], max_concurrency: int = 5) -> List[ToolResponse]:
+        """Run several searches concurrently
+
+        Args:
+            queries: Search queries
+            max_concurrency: Maximum number of this batch's searches in flight
+                at once; all searches also share the web_search limit
+
+        Returns:
+            One ToolResponse per query, in the same order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def search(query: str) -> ToolResponse:
+            if not self.validate_params({"query": query}):
+                return ToolResponse(
+                    success=False,
+                    error="Invalid or missing query parameter",
+                    result=None
+                )
+            async with semaphore, get_semaphore(self.name):
+                return await self._search(query)
+
+        return list(await asyncio.gather(*(search(query) for query in queries)))
+
+class WebSearchBatchTool(BaseTool):
+    """Tool that runs several web searches in one call
+
+    Lets the model ask for every sub-query it needs (flights, hotels, routes,
+    ...) in a single tool call, which are then searched concurrently.
+    """
+
+    cache_ttl = WebSearchTool.cache_ttl
+
+    def __init__(self, search_tool: WebSearchTool, max_concurrency: int = 5):
+        """Initialize the batch search tool
+
+        Args:
+            search_tool: WebSearchTool used to run each query
+            max_concurrency: Maximum number of searches in flight at once
+        """
+        super().__init__(name="web_search_batch")
+        self.search_tool = search_tool
+        self.max_concurrency = max_concurrency
+
+    @property
+    def description(self) -> str:
+        """Get the tool description"""
+        return (
+            "Search the web for several things at once using Tavily AI. "
+            "Pass every search query in queries"
+        )
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        """JSON schema of the batch's queries"""
+        return {
+            "type": "object",
+            "properties": {
+                "queries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Search queries, one per thing to look up"
+                }
+            },
+            "required": ["queries"]
+        }
+
+    def validate_params(self, params: Dict[str, Any]) -> bool:
+        """Validate batch search parameters
+
+        Args:
+            params: Dictionary of parameters to validate
+
+        Returns:
+            True if parameters are valid, False otherwise
+        """
+        return self.search_tool.validate_params(params)
+
+    async def execute(self, **kwargs) -> ToolResponse:
+        """Execute every search in the batch
+
+        Args:
+            **kwargs: Must include 'queries' as a list, or 'query' with one
+                query per line (or separated by semicolons)
+
+        Returns:
+            ToolResponse with the results of every query, or an error if
+            all of them failed
+        """
+        queries = kwargs.get("queries")
+        if queries is None:
+            query = kwargs.get("query")
+            if not self.validate_params({"query": query}):
+                return ToolResponse(
+                    success=False,
+                    error="Invalid or missing query parameter",
+                    result=None
+                )
+            queries = [q.strip() for q in re.split(r"[\n;]", query) if q.strip()]
+
+        logger.info("Executing %d Tavily searches", len(queries))
+        responses = await self.search_tool.batch_search(queries, self.max_concurrency)
+
+        if not any(response.success for response in responses):
+            return ToolResponse(
+                success=False,
+                result=None,
+                error="; ".join(response.error or "Search failed" for response in responses)
+            )
+
+        sections = []
+        for query, response in zip(queries, responses):
+            sections.append(f"Results for '{query}':\n{response.result if response.success else response.error}")
+        return ToolResponse(
+            success=True,
+            result="\n".join(sections),
+            error=None
+        )
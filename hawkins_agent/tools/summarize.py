@@ -10,6 +10,9 @@ logger = logging.getLogger(__name__)
 class SummarizationTool(BaseTool):
     """Tool for summarizing long text content"""
 
+    # The result is already a summary
+    needs_summary = False
+
     def __init__(self):
         """Initialize the summarization tool"""
         super().__init__(name="text_summarize")
@@ -59,7 +62,7 @@ class SummarizationTool(BaseTool):
                 )
 
             logger.info("Executing text summarization")
-            logger.debug(f"Input text length: {len(text)}")
+            logger.debug("Input text length: %d", len(text))
 
             # Handle empty or very short text
             if len(text.strip()) < 50:
@@ -92,7 +95,7 @@ class SummarizationTool(BaseTool):
                 # For shorter texts, use all sentences
                 summary = '. '.join(sentences) + '.'
 
-            logger.info(f"Generated summary of length {len(summary)}")
+            logger.info("Generated summary of length %d", len(summary))
             return ToolResponse(
                 success=True,
                 result=summary,
@@ -1,5 +1,7 @@
 """Weather data tool implementation using OpenWeatherMap API"""
 
+import asyncio
+import httpx
 import requests
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
@@ -13,13 +15,19 @@ logger = logging.getLogger(__name__)
 class WeatherTool(BaseTool):
     """Tool for fetching weather data using OpenWeatherMap API"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    # Current conditions change slowly enough to reuse for a few minutes
+    cache_ttl = 300
+
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
         """Initialize the weather tool
 
         Args:
             api_key: OpenWeatherMap API key. If not provided, will try to get from environment.
+            client: Optional shared async HTTP client (see create_http_client).
+                Without one, requests are made with requests in a worker thread.
         """
         super().__init__(name="weather")
+        self.client = client
         self.api_key = api_key or os.environ.get("OPENWEATHERMAP_API_KEY")
         if not self.api_key:
             logger.warning("No OpenWeatherMap API key provided")
@@ -69,7 +77,7 @@ class WeatherTool(BaseTool):
         try:
             # Extract and validate parameters
             query = kwargs.get("query", "")
-            logger.info(f"Processing weather query: {query}")
+            logger.info("Processing weather query: %s", query)
 
             if not self.validate_params({"query": query}):
                 return ToolResponse(
@@ -81,24 +89,31 @@ class WeatherTool(BaseTool):
             # Parse query parameters
             city_name, country_code = [part.strip() for part in query.split(',')]
 
-            logger.info(f"Fetching weather data for {city_name}, {country_code}")
-            logger.debug(f"Using API key: {'*' * 4}{self.api_key[-4:]}")
+            logger.info("Fetching weather data for %s, %s", city_name, country_code)
+            logger.debug("Using API key: ****%s", self.api_key[-4:])
+
+            params = {
+                "q": f"{city_name},{country_code}",
+                "units": "metric",  # Use metric units
+                "appid": self.api_key
+            }
 
-            # Make API request
             try:
-                response = requests.get(
-                    self.BASE_URL,
-                    params={
-                        "q": f"{city_name},{country_code}",
-                        "units": "metric",  # Use metric units
-                        "appid": self.api_key
-                    },
-                    timeout=10  # Add timeout
-                )
+                if self.client is not None:
+                    # Reuse the shared client's warm connection
+                    response = await self.client.get(self.BASE_URL, params=params, timeout=10)
+                else:
+                    # Make API request in a worker thread so the event loop stays free
+                    response = await asyncio.to_thread(
+                        requests.get,
+                        self.BASE_URL,
+                        params=params,
+                        timeout=10  # Add timeout
+                    )
 
                 response.raise_for_status()  # Raise exception for bad status codes
 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, httpx.HTTPError) as e:
                 error_msg = f"Weather API request failed: {str(e)}"
                 logger.error(error_msg)
                 return ToolResponse(
@@ -109,7 +124,7 @@ class WeatherTool(BaseTool):
 
             # Parse response
             data = response.json()
-            logger.debug(f"Received weather data: {data}")
+            logger.debug("Received weather data: %s", data)
 
             # Extract relevant information
             try:
@@ -122,8 +137,8 @@ class WeatherTool(BaseTool):
                     "pressure": data["main"]["pressure"],  # hPa
                 }
 
-                logger.info(f"Successfully retrieved weather data for {city_name}")
-                logger.debug(f"Processed weather info: {weather_info}")
+                logger.info("Successfully retrieved weather data for %s", city_name)
+                logger.debug("Processed weather info: %s", weather_info)
 
                 return ToolResponse(
                     success=True,
@@ -20,10 +20,12 @@ class MessageRole(str, Enum):
     ASSISTANT = "assistant"
     SYSTEM = "system"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Message:
     """Represents a message in the conversation
 
+    Messages are immutable so they can be shared between requests.
+
     Attributes:
         role: The role of the message sender (user, assistant, or system)
         content: The actual content of the message
@@ -33,7 +35,7 @@ class Message:
     content: str
     metadata: Optional[Dict[str, Any]] = None
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse:
     """Represents an agent's response to a user message
 
@@ -46,7 +48,7 @@ class AgentResponse:
     tool_calls: List[Dict[str, Any]]
     metadata: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True)
 class ToolResponse:
     """Represents a tool's response after execution
 
@@ -30,8 +30,10 @@ setup(
         "google-api-python-client>=2.156.0",
         "hawkins-rag>=0.1.0",
         "hawkinsdb>=1.0.1",
+        "httpx[http2]>=0.24.0",
         "litellm>=1.0.0",
         "openai>=1.58.1",
+        "orjson>=3.9.0",
         "python-dotenv>=0.19.0",
         "serpapi>=0.1.5",
         "tavily-python>=0.5.0",
@@ -42,6 +44,13 @@ setup(
             "pytest>=7.0.0",
             "black>=22.0.0",
             "mypy>=1.0.0"
+        ],
+        "semantic-cache": [
+            "numpy>=1.24.0",
+            "sentence-transformers>=2.2.0"
+        ],
+        "speedups": [
+            "uvloop>=0.18.0; sys_platform != 'win32'"
         ]
     },
 )
\ No newline at end of file